@@ -1,7 +1,9 @@
+import threading
 import time
 from typing import Optional, Dict, List, Any
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from config import FINNHUB_API_KEY, FINNHUB_RATE_LIMIT
 
@@ -19,19 +21,26 @@ class FinnhubClient:
 
     def __init__(self, api_key: str = FINNHUB_API_KEY):
         self.api_key = api_key
+        # Own session rather than utils.http.http_session: its urllib3 retries
+        # would swallow the 429s that _get turns into FinnhubRateLimitError.
+        # Pool sized for concurrent callers; retries stay in _get.
         self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
         self._call_times: List[float] = []
+        # Callers may issue requests from several threads (e.g. market indices)
+        self._rate_lock = threading.Lock()
 
     def _rate_limit(self):
-        now = time.time()
-        self._call_times = [t for t in self._call_times if now - t < 60]
+        with self._rate_lock:
+            now = time.time()
+            self._call_times = [t for t in self._call_times if now - t < 60]
 
-        if len(self._call_times) >= FINNHUB_RATE_LIMIT:
-            sleep_time = 61 - (now - self._call_times[0])
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+            if len(self._call_times) >= FINNHUB_RATE_LIMIT:
+                sleep_time = 61 - (now - self._call_times[0])
+                if sleep_time > 0:
+                    time.sleep(sleep_time)
 
-        self._call_times.append(now)
+            self._call_times.append(now)
 
     def _get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
         params = params or {}
@@ -5,9 +5,8 @@ import time
 from pathlib import Path
 from typing import Dict, Tuple
 
-import requests
-
 from config import FALLBACK_FILE
+from utils.http import http_session
 
 SP500_URL = "https://www.sp500live.co/sp500_companies.json"
 TIMEOUT = 10
@@ -32,7 +31,7 @@ def fetch_sp500_live() -> Tuple[Dict, str]:
     last_error = None
     for attempt in range(RETRIES + 1):
         try:
-            response = requests.get(SP500_URL, timeout=TIMEOUT)
+            response = http_session.get(SP500_URL, timeout=TIMEOUT)
             response.raise_for_status()
             return response.json(), "live"
         except Exception as exc:
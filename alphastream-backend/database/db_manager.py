@@ -1,17 +1,144 @@
 import sqlite3
 import threading
+from collections import namedtuple
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 
+# Typed rows for hot read paths (attribute access instead of dict lookups)
+IndexRow = namedtuple("IndexRow", "symbol name value change change_pct")
+
+# stocks columns in schema order, as passed to insert_stocks_bulk
+STOCK_COLUMNS = (
+  "ticker", "name", "sector", "industry", "price", "change_1d", "change_1w", "change_1m",
+  "change_1y", "change_5y", "change_ytd", "volume", "high_1d", "low_1d", "high_1m",
+  "low_1m", "high_1y", "low_1y", "high_5y", "low_5y", "pe_ratio", "eps",
+  "dividend_yield", "market_cap", "shares_outstanding", "net_profit_margin",
+  "gross_margin", "roe", "revenue_ttm", "beta", "institutional_ownership",
+  "debt_to_equity", "year_founded", "website", "city", "state", "zip", "weight",
+  "last_updated", "data_source", "is_sp500",
+)
+_stock_from_dict = itemgetter(*STOCK_COLUMNS)
+
+# price_bars columns as passed to upsert_price_bars_bulk (last_updated is stamped there)
+PRICE_BAR_COLUMNS = (
+  "symbol", "timeframe", "bar_time", "open", "high", "low", "close", "volume", "source",
+)
+_price_bar_from_dict = itemgetter(*PRICE_BAR_COLUMNS)
+
+# news_articles columns as passed to upsert_news_articles_bulk (last_cached is stamped there)
+NEWS_ARTICLE_COLUMNS = (
+  "ticker", "title", "url", "published_date", "snippet", "site", "publisher", "image",
+)
+_news_article_from_dict = itemgetter(*NEWS_ARTICLE_COLUMNS)
+
+# sector_performance_history columns as passed to upsert_sector_history_bulk
+SECTOR_HISTORY_COLUMNS = ("date", "sector", "exchange", "average_change")
+_sector_history_from_dict = itemgetter(*SECTOR_HISTORY_COLUMNS)
+
+
+def _insert_sql(table: str, columns: Tuple[str, ...], verb: str = "INSERT OR REPLACE",
+                suffix: str = "") -> str:
+  """Build a positional INSERT for table/columns (generated once, at import)."""
+  return (
+    f"{verb} INTO {table} ({', '.join(columns)}) "
+    f"VALUES ({', '.join('?' * len(columns))}){suffix}"
+  )
+
+# Per-connection settings (connections are opened per call, so these stay
+# cheap): NORMAL skips the per-commit fsync, which is safe under WAL.
+# journal_mode=WAL itself persists in the DB file and is set once (_enable_wal).
+_CONNECTION_PRAGMAS = (
+  "PRAGMA synchronous=NORMAL",
+  "PRAGMA temp_store=MEMORY",
+)
+
 
 class DatabaseManager:
   """Manages SQLite database for stock data caching"""
 
+  # Write statements are generated once so every call passes sqlite3 the
+  # identical SQL text and hits the connection's prepared-statement cache.
+  STOCK_UPSERT_SQL = _insert_sql("stocks", STOCK_COLUMNS)
+  # Rows per insert_stocks_bulk transaction: one for a full S&P 500 refresh,
+  # while bigger loads release the write lock between chunks
+  STOCK_BATCH_SIZE = 500
+  # Errors caused by a row's own data (constraint violations, unbindable
+  # values), which a row-by-row retry can isolate
+  _ROW_ERRORS = (sqlite3.IntegrityError, sqlite3.InterfaceError, sqlite3.ProgrammingError)
+  INDEX_UPSERT_SQL = _insert_sql(
+    "market_indices", ("symbol", "name", "value", "change", "change_pct", "last_updated")
+  )
+  MOVER_INSERT_SQL = _insert_sql(
+    "market_movers",
+    ("ticker", "name", "price", "change", "change_percent", "volume", "category",
+     "market_cap", "last_updated"),
+    verb="INSERT",
+  )
+  TREASURY_UPSERT_SQL = _insert_sql(
+    "treasury_history", ("date", "yield_10y", "yield_2y", "last_updated")
+  )
+  CPI_UPSERT_SQL = _insert_sql(
+    "cpi_history", ("date", "cpi_value", "mom_change", "yoy_change", "last_updated")
+  )
+  VIX_UPSERT_SQL = _insert_sql(
+    "vix_history", ("date", "vix_close", "vix_high", "vix_low", "last_updated")
+  )
+  PRICE_BAR_UPSERT_SQL = _insert_sql(
+    "price_bars",
+    (*PRICE_BAR_COLUMNS, "last_updated"),
+    verb="INSERT",
+    suffix=(
+      " ON CONFLICT(symbol, timeframe, bar_time) DO UPDATE SET"
+      " open = excluded.open,"
+      " high = excluded.high,"
+      " low = excluded.low,"
+      " close = excluded.close,"
+      " volume = excluded.volume,"
+      " source = excluded.source,"
+      " last_updated = excluded.last_updated"
+    ),
+  )
+  SECTOR_HISTORY_UPSERT_SQL = _insert_sql(
+    "sector_performance_history",
+    (*SECTOR_HISTORY_COLUMNS, "last_cached"),
+    verb="INSERT",
+    suffix=(
+      " ON CONFLICT(date, sector) DO UPDATE SET"
+      " exchange = excluded.exchange,"
+      " average_change = excluded.average_change,"
+      " last_cached = excluded.last_cached"
+    ),
+  )
+  NEWS_UPSERT_SQL = _insert_sql("news_articles", (*NEWS_ARTICLE_COLUMNS, "last_cached"))
+  PRICE_BAR_PRUNE_SQL = (
+    "DELETE FROM price_bars WHERE symbol = ? AND timeframe = ? AND bar_time < ?"
+  )
+  EARNING_UPSERT_SQL = _insert_sql(
+    "earnings_calendar",
+    ("ticker", "company_name", "report_date", "fiscal_period", "eps_estimate",
+     "eps_actual", "revenue_estimate", "revenue_actual", "time", "last_updated"),
+    verb="INSERT",
+    suffix=(
+      " ON CONFLICT(ticker, report_date, fiscal_period) DO UPDATE SET"
+      " company_name = excluded.company_name,"
+      " eps_estimate = excluded.eps_estimate,"
+      " eps_actual = excluded.eps_actual,"
+      " revenue_estimate = excluded.revenue_estimate,"
+      " revenue_actual = excluded.revenue_actual,"
+      " time = excluded.time,"
+      " last_updated = excluded.last_updated"
+    ),
+  )
+
   def __init__(self, db_path: str = "data/stocks.db"):
       self.db_path = db_path
       Path(db_path).parent.mkdir(parents=True, exist_ok=True)
       self._local = threading.local()  # ADD THIS LINE
+      # journal_mode=WAL is applied once per process (see connect)
+      self._wal_lock = threading.Lock()
+      self._wal_set = False
   
   def connect(self):
       """Get thread-local connection"""
@@ -23,8 +150,24 @@ class DatabaseManager:
               timeout=30.0
           )
           self._local.connection.row_factory = sqlite3.Row
+          for pragma in _CONNECTION_PRAGMAS:
+              self._local.connection.execute(pragma)
+          if not self._wal_set:
+              self._enable_wal(self._local.connection)
       return self._local.connection
   
+  def _enable_wal(self, conn: sqlite3.Connection):
+      """
+      Switch the DB file to WAL (WAL lets API reads proceed during importer
+      writes). The mode persists in the file, so this runs once per process:
+      from init_database for new databases, or on the first connect() for
+      existing ones such as data/stocks.db.
+      """
+      with self._wal_lock:
+          if not self._wal_set:
+              conn.execute("PRAGMA journal_mode=WAL")
+              self._wal_set = True
+
   def close(self):
       """Close thread-local connection"""
       # REPLACE OLD close() METHOD WITH THIS:
@@ -40,54 +183,67 @@ class DatabaseManager:
       schema = f.read()
 
     conn = self.connect()
+    self._enable_wal(conn)
     conn.executescript(schema)
     conn.commit()
     print(f"Database initialized at {self.db_path}")
     self.close()
 
-  def insert_stocks_bulk(self, stocks: List[dict]) -> int:
-    """Insert multiple stocks efficiently"""
+  def insert_stocks_bulk(
+    self, stocks: Iterable[Union[dict, tuple]]
+  ) -> int:
+    """
+    Insert multiple stocks efficiently.
+    Accepts dicts keyed by column or tuples in STOCK_COLUMNS order;
+    rows are written in STOCK_BATCH_SIZE chunks via executemany.
+    """
+    rows = [
+      stock if isinstance(stock, tuple) else _stock_from_dict(stock)
+      for stock in stocks
+    ]
     conn = self.connect()
-    cursor = conn.cursor()
-    success_count = 0
 
     try:
-      for stock in stocks:
+      success_count = 0
+      chunks = 0
+      for start in range(0, len(rows), self.STOCK_BATCH_SIZE):
+        chunk = rows[start:start + self.STOCK_BATCH_SIZE]
+        chunks += 1
         try:
-          cursor.execute("""
-            INSERT OR REPLACE INTO stocks (
-              ticker, name, sector, industry,
-              price, change_1d, change_1w, change_1m, change_1y, change_5y, change_ytd,
-              volume,
-              high_1d, low_1d, high_1m, low_1m, high_1y, low_1y, high_5y, low_5y,
-              pe_ratio, eps, dividend_yield, market_cap, shares_outstanding,
-              net_profit_margin, gross_margin, roe, revenue_ttm,
-              beta, institutional_ownership, debt_to_equity,
-              year_founded, website, city, state, zip, weight,
-              last_updated, data_source, is_sp500
-            ) VALUES (
-              :ticker, :name, :sector, :industry,
-              :price, :change_1d, :change_1w, :change_1m, :change_1y, :change_5y, :change_ytd,
-              :volume,
-              :high_1d, :low_1d, :high_1m, :low_1m, :high_1y, :low_1y, :high_5y, :low_5y,
-              :pe_ratio, :eps, :dividend_yield, :market_cap, :shares_outstanding,
-              :net_profit_margin, :gross_margin, :roe, :revenue_ttm,
-              :beta, :institutional_ownership, :debt_to_equity,
-              :year_founded, :website, :city, :state, :zip, :weight,
-              :last_updated, :data_source, :is_sp500
-            )
-          """, stock)
-          success_count += 1
-        except Exception as e:
-          print(f"Error inserting {stock.get('ticker')}: {e}")
+          with conn:
+            # Take the write lock up front: concurrent refresh stages also
+            # write, and a deferred BEGIN can fail with SQLITE_BUSY on upgrade
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(self.STOCK_UPSERT_SQL, chunk)
+          success_count += len(chunk)
+        except self._ROW_ERRORS as e:
+          # A bad row aborts its chunk; retry that chunk row by row to keep
+          # the good ones (earlier chunks are already committed).
+          # OperationalError (e.g. database is locked) propagates: retrying
+          # 500 rows would just wait out the busy timeout 500 times.
+          print(f"Bulk stock insert failed ({e}), retrying chunk row by row")
+          for row in chunk:
+            try:
+              conn.execute(self.STOCK_UPSERT_SQL, row)
+              success_count += 1
+            except self._ROW_ERRORS as row_error:
+              print(f"Error inserting {row[0]}: {row_error}")
+          conn.commit()
 
-      conn.commit()
-      print(f"Inserted/updated {success_count}/{len(stocks)} stocks")
+      print(f"Inserted/updated {success_count}/{len(rows)} stocks in {chunks} chunk(s)")
       return success_count
 
     finally:
       self.close()
 
+  def insert_stocks_bulk_cols(self, columns: Dict[str, list]) -> int:
+    """
+    Insert stocks given column-major data: {column name: values}, one
+    list per STOCK_COLUMNS entry. The columns are zipped into row tuples
+    in schema order and passed to insert_stocks_bulk.
+    """
+    return self.insert_stocks_bulk(zip(*(columns[col] for col in STOCK_COLUMNS)))
+
   def get_stock(self, ticker: str) -> Optional[dict]:
     """Get a single stock by ticker"""
     conn = self.connect()
@@ -112,6 +268,28 @@ class DatabaseManager:
     finally:
       self.close()
 
+  def count_stocks(self) -> int:
+    """Count stocks without materializing rows"""
+    conn = self.connect()
+    cursor = conn.cursor()
+
+    try:
+      cursor.execute("SELECT COUNT(*) FROM stocks")
+      return cursor.fetchone()[0]
+    finally:
+      self.close()
+
+  def get_fresh_tickers(self, since: str) -> List[str]:
+    """Tickers whose row was last updated at or after since (ISO timestamp)"""
+    conn = self.connect()
+    cursor = conn.cursor()
+
+    try:
+      cursor.execute("SELECT ticker FROM stocks WHERE last_updated >= ?", (since,))
+      return [row[0] for row in cursor.fetchall()]
+    finally:
+      self.close()
+
   def search_stocks(self, query: str) -> List[dict]:
     """Search stocks by ticker or name"""
     conn = self.connect()
@@ -204,6 +382,37 @@ class DatabaseManager:
     finally:
       self.close()
 
+  def get_status_bundle(
+      self, include_count: bool = False, history_limit: int = 5
+  ) -> Tuple[Optional[float], List[dict], Optional[int]]:
+    """Return (data age minutes, recent refreshes, stock count) on one connection"""
+    conn = self.connect()
+    cursor = conn.cursor()
+    try:
+      cursor.execute("""
+        SELECT 
+          (julianday('now') - julianday(MAX(last_updated))) * 24 * 60 as age_minutes
+        FROM stocks
+      """)
+      result = cursor.fetchone()
+      age = result['age_minutes'] if result else None
+
+      cursor.execute("""
+        SELECT refresh_time, stocks_updated, data_source, success, error_message, duration_seconds
+        FROM refresh_log
+        ORDER BY refresh_time DESC
+        LIMIT ?
+      """, (history_limit,))
+      history = [dict(row) for row in cursor.fetchall()]
+
+      count = None
+      if include_count:
+        cursor.execute("SELECT COUNT(*) FROM stocks")
+        count = cursor.fetchone()[0]
+      return age, history, count
+    finally:
+      self.close()
+
   # ============================================================================
   # MARKET INDICES METHODS
   # ============================================================================
@@ -213,15 +422,30 @@ class DatabaseManager:
     conn = self.connect()
     cursor = conn.cursor()
     try:
-      cursor.execute('''
-        INSERT OR REPLACE INTO market_indices 
-        (symbol, name, value, change, change_pct, last_updated)
-        VALUES (?, ?, ?, ?, ?, ?)
-      ''', (symbol, name, value, change, change_pct, datetime.now().isoformat()))
+      cursor.execute(
+        self.INDEX_UPSERT_SQL,
+        (symbol, name, value, change, change_pct, datetime.now().isoformat()),
+      )
       conn.commit()
     finally:
       self.close()
 
+  def bulk_insert_indices(self, rows: List[tuple]) -> int:
+    """
+    Insert or update many market indices in one transaction.
+    Each row: (symbol, name, value, change, change_pct)
+    """
+    if not rows:
+      return 0
+    conn = self.connect()
+    now = datetime.now().isoformat()
+    try:
+      with conn:
+        conn.executemany(self.INDEX_UPSERT_SQL, [(*row, now) for row in rows])
+      return len(rows)
+    finally:
+      self.close()
+
   def get_all_indices(self) -> List[dict]:
     """Get all market indices"""
     conn = self.connect()
@@ -233,6 +457,20 @@ class DatabaseManager:
     finally:
       self.close()
 
+  def get_index_rows(self) -> List[IndexRow]:
+    """Get all market indices as typed IndexRow tuples"""
+    conn = self.connect()
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    try:
+      cursor.execute(
+        "SELECT symbol, name, value, change, change_pct FROM market_indices"
+      )
+      make = IndexRow._make
+      return [make(row) for row in cursor.fetchall()]
+    finally:
+      self.close()
+
   # ============================================================================
   # SECTOR PERFORMANCE
   # ============================================================================
@@ -253,6 +491,29 @@ class DatabaseManager:
     finally:
       self.close()
 
+  def bulk_upsert_sector_performance(self, rows: List[tuple]) -> int:
+    """
+    Insert or update many sector performance snapshots in one transaction.
+    Each row: (sector, change_percent)
+    """
+    if not rows:
+      return 0
+    conn = self.connect()
+    now = datetime.now().isoformat()
+    try:
+      with conn:
+        conn.executemany(
+          """
+          INSERT OR REPLACE INTO sector_performance
+          (sector, change_percent, last_updated)
+          VALUES (?, ?, ?)
+          """,
+          [(*row, now) for row in rows],
+        )
+      return len(rows)
+    finally:
+      self.close()
+
   def get_sector_performance(self) -> list:
     """Return cached sector performance records."""
     conn = self.connect()
@@ -295,11 +556,7 @@ class DatabaseManager:
     cursor = conn.cursor()
     try:
       cursor.execute(
-        """
-        INSERT INTO market_movers
-        (ticker, name, price, change, change_percent, volume, category, market_cap, last_updated)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
+        self.MOVER_INSERT_SQL,
         (
           ticker,
           name,
@@ -316,6 +573,24 @@ class DatabaseManager:
     finally:
       self.close()
 
+  def bulk_insert_market_movers(self, rows: List[tuple], clear: bool = True) -> int:
+    """
+    Insert many market mover rows in one transaction.
+    Each row: (ticker, name, price, change, change_percent, volume, category, market_cap)
+    With clear=True the old rows are deleted in the same transaction, so readers
+    never observe an empty table.
+    """
+    conn = self.connect()
+    now = datetime.now().isoformat()
+    try:
+      with conn:
+        if clear:
+          conn.execute("DELETE FROM market_movers")
+        conn.executemany(self.MOVER_INSERT_SQL, [(*row, now) for row in rows])
+      return len(rows)
+    finally:
+      self.close()
+
   def get_market_movers(self, category: str = None) -> list:
     """Retrieve movers, optionally filtered by category."""
     conn = self.connect()
@@ -353,12 +628,7 @@ class DatabaseManager:
     cursor = conn.cursor()
     try:
       cursor.execute(
-        """
-        INSERT OR REPLACE INTO earnings_calendar
-        (ticker, company_name, report_date, fiscal_period, eps_estimate, eps_actual,
-         revenue_estimate, revenue_actual, time, last_updated)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
+        self.EARNING_UPSERT_SQL,
         (
           ticker,
           company_name,
@@ -376,6 +646,23 @@ class DatabaseManager:
     finally:
       self.close()
 
+  def insert_or_update_earnings_bulk(self, rows: List[tuple]) -> int:
+    """
+    Upsert many earnings calendar rows in one transaction.
+    Each row: (ticker, company_name, report_date, fiscal_period, eps_estimate,
+               eps_actual, revenue_estimate, revenue_actual, time)
+    """
+    if not rows:
+      return 0
+    conn = self.connect()
+    now = datetime.now().isoformat()
+    try:
+      with conn:
+        conn.executemany(self.EARNING_UPSERT_SQL, [(*row, now) for row in rows])
+      return len(rows)
+    finally:
+      self.close()
+
   def get_earnings_calendar(self, from_date: str = None, to_date: str = None) -> list:
     """Retrieve earnings calendar entries."""
     conn = self.connect()
@@ -400,36 +687,24 @@ class DatabaseManager:
   # ============================================================================
   # NEWS ARTICLES
   # ============================================================================
-  def upsert_news_articles_bulk(self, articles: List[dict]) -> int:
-    """Upsert multiple news articles keyed by URL."""
-    if not articles:
+  def upsert_news_articles_bulk(self, articles: Iterable[Union[tuple, dict]]) -> int:
+    """
+    Upsert multiple news articles keyed by URL in one write transaction.
+    Accepts tuples in NEWS_ARTICLE_COLUMNS order or dicts keyed by column.
+    """
+    now = datetime.now().isoformat()
+    rows = [
+      (*(item if isinstance(item, tuple) else _news_article_from_dict(item)), now)
+      for item in articles
+    ]
+    if not rows:
       return 0
     conn = self.connect()
-    cursor = conn.cursor()
-    inserted = 0
     try:
-      for item in articles:
-        cursor.execute(
-          """
-          INSERT OR REPLACE INTO news_articles
-          (ticker, title, url, published_date, snippet, site, publisher, image, last_cached)
-          VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-          """,
-          (
-            item.get("ticker"),
-            item.get("title"),
-            item.get("url"),
-            item.get("published_date"),
-            item.get("snippet"),
-            item.get("site"),
-            item.get("publisher"),
-            item.get("image"),
-            datetime.now().isoformat(),
-          ),
-        )
-        inserted += 1
-      conn.commit()
-      return inserted
+      with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(self.NEWS_UPSERT_SQL, rows)
+      return len(rows)
     finally:
       self.close()
 
@@ -490,32 +765,26 @@ class DatabaseManager:
   # ============================================================================
   # SECTOR PERFORMANCE HISTORY
   # ============================================================================
-  def upsert_sector_history_bulk(self, rows: List[dict]) -> int:
-    """Insert or replace sector performance history rows."""
+  def upsert_sector_history_bulk(self, rows: Iterable[Union[tuple, dict]]) -> int:
+    """
+    Insert or update sector performance history rows in one write transaction.
+    Accepts tuples in SECTOR_HISTORY_COLUMNS order or dicts keyed by column.
+    Existing (date, sector) rows are updated in place rather than deleted
+    and re-inserted, so a re-fetched backfill day leaves the index alone.
+    """
+    now = datetime.now().isoformat()
+    rows = [
+      (*(row if isinstance(row, tuple) else _sector_history_from_dict(row)), now)
+      for row in rows
+    ]
     if not rows:
       return 0
     conn = self.connect()
-    cursor = conn.cursor()
-    inserted = 0
     try:
-      for row in rows:
-        cursor.execute(
-          """
-          INSERT OR REPLACE INTO sector_performance_history
-          (date, sector, exchange, average_change, last_cached)
-          VALUES (?, ?, ?, ?, ?)
-          """,
-          (
-            row.get("date"),
-            row.get("sector"),
-            row.get("exchange"),
-            row.get("average_change"),
-            datetime.now().isoformat(),
-          ),
-        )
-        inserted += 1
-      conn.commit()
-      return inserted
+      with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(self.SECTOR_HISTORY_UPSERT_SQL, rows)
+      return len(rows)
     finally:
       self.close()
 
@@ -573,37 +842,42 @@ class DatabaseManager:
   # ============================================================================
   # PRICE BARS
   # ============================================================================
-  def upsert_price_bars_bulk(self, bars: List[dict]) -> int:
-    """Insert or replace multiple price bars."""
-    if not bars:
+  def upsert_price_bars_bulk(
+    self, bars: Iterable[Union[tuple, dict]], prune_older: bool = False
+  ) -> int:
+    """
+    Insert or update multiple price bars in one write transaction.
+    Accepts tuples in PRICE_BAR_COLUMNS order or dicts keyed by column.
+    Existing (symbol, timeframe, bar_time) rows are updated in place, so
+    readers never see a symbol's bars missing mid-refresh.
+    With prune_older, each (symbol, timeframe)'s rows older than its oldest
+    bar in this batch are deleted in the same transaction, so a refresh
+    replaces the cached window instead of growing it.
+    """
+    now = datetime.now().isoformat()
+    rows = [
+      (*(bar if isinstance(bar, tuple) else _price_bar_from_dict(bar)), now)
+      for bar in bars
+    ]
+    if not rows:
       return 0
+    oldest: Dict[Tuple[str, str], str] = {}
+    if prune_older:
+      for symbol, timeframe, bar_time, *_ in rows:
+        key = (symbol, timeframe)
+        if bar_time is not None and (key not in oldest or bar_time < oldest[key]):
+          oldest[key] = bar_time
     conn = self.connect()
-    cursor = conn.cursor()
-    inserted = 0
     try:
-      for bar in bars:
-        cursor.execute(
-          """
-          INSERT OR REPLACE INTO price_bars
-          (symbol, timeframe, bar_time, open, high, low, close, volume, source, last_updated)
-          VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-          """,
-          (
-            bar.get("symbol"),
-            bar.get("timeframe"),
-            bar.get("bar_time"),
-            bar.get("open"),
-            bar.get("high"),
-            bar.get("low"),
-            bar.get("close"),
-            bar.get("volume"),
-            bar.get("source"),
-            datetime.now().isoformat(),
-          ),
-        )
-        inserted += 1
-      conn.commit()
-      return inserted
+      with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany(self.PRICE_BAR_UPSERT_SQL, rows)
+        if oldest:
+          conn.executemany(
+            self.PRICE_BAR_PRUNE_SQL,
+            [(symbol, timeframe, cutoff) for (symbol, timeframe), cutoff in oldest.items()],
+          )
+      return len(rows)
     finally:
       self.close()
 
@@ -614,8 +888,12 @@ class DatabaseManager:
       limit: int = 1500,
       start_time: str = None,
       end_time: str = None,
+      order: str = "desc",
   ) -> List[dict]:
-    """Retrieve price bars for a symbol/timeframe ordered newest -> oldest."""
+    """
+    Retrieve the newest `limit` price bars for a symbol/timeframe, ordered
+    newest -> oldest, or oldest -> newest with order="asc".
+    """
     conn = self.connect()
     cursor = conn.cursor()
     try:
@@ -633,75 +911,97 @@ class DatabaseManager:
         params.append(end_time)
       query += " ORDER BY bar_time DESC LIMIT ?"
       params.append(limit)
+      if order == "asc":
+        # Still the newest `limit` bars, just handed back chronologically
+        query = f"SELECT * FROM ({query}) ORDER BY bar_time ASC"
       cursor.execute(query, tuple(params))
       rows = cursor.fetchall()
       return [dict(row) for row in rows]
     finally:
       self.close()
 
-  def get_eod_last_updated(self, symbol: str) -> Optional[str]:
-    """Get the last_updated timestamp for EOD data of a symbol."""
+  def has_null_closes(self, symbol: str, timeframe: str, newest: int = 5) -> bool:
+    """Whether any of the newest `newest` bars of symbol/timeframe has a NULL close."""
     conn = self.connect()
     cursor = conn.cursor()
     try:
       cursor.execute(
         """
-        SELECT last_updated FROM price_bars
-        WHERE symbol = ? AND timeframe = '1day'
-        ORDER BY last_updated DESC LIMIT 1
+        SELECT EXISTS (
+          SELECT 1 FROM (
+            SELECT close FROM price_bars
+            WHERE symbol = ? AND timeframe = ?
+            ORDER BY bar_time DESC LIMIT ?
+          )
+          WHERE close IS NULL
+        )
         """,
-        (symbol,),
+        (symbol, timeframe, newest),
       )
-      row = cursor.fetchone()
-      return row["last_updated"] if row else None
+      return bool(cursor.fetchone()[0])
     finally:
       self.close()
 
-  def delete_eod_bars(self, symbol: str) -> int:
-    """Delete all EOD bars for a symbol (used for cache invalidation)."""
+  def get_eod_close_bookends(self, symbol: str, bars: int) -> Optional[Tuple[float, float]]:
+    """
+    (oldest close, newest close) across the newest `bars` EOD bars of a
+    symbol, in one query. None if fewer than two bars are cached.
+    """
     conn = self.connect()
     cursor = conn.cursor()
     try:
       cursor.execute(
-        "DELETE FROM price_bars WHERE symbol = ? AND timeframe = '1day'",
-        (symbol,),
+        """
+        WITH w AS (
+          SELECT bar_time, close FROM price_bars
+          WHERE symbol = ? AND timeframe = '1day'
+          ORDER BY bar_time DESC LIMIT ?
+        )
+        SELECT
+          (SELECT close FROM w ORDER BY bar_time ASC LIMIT 1),
+          (SELECT close FROM w ORDER BY bar_time DESC LIMIT 1),
+          (SELECT COUNT(*) FROM w)
+        """,
+        (symbol, bars),
       )
-      deleted = cursor.rowcount
-      conn.commit()
-      return deleted
+      start, end, count = cursor.fetchone()
+      return (start, end) if count >= 2 else None
     finally:
       self.close()
 
-  def get_intraday_last_updated(self, symbol: str, timeframe: str = "5min") -> Optional[str]:
-    """Get the last_updated timestamp for intraday data of a symbol."""
+  def get_eod_last_updated(self, symbol: str) -> Optional[str]:
+    """Get the last_updated timestamp for EOD data of a symbol."""
     conn = self.connect()
     cursor = conn.cursor()
     try:
       cursor.execute(
         """
         SELECT last_updated FROM price_bars
-        WHERE symbol = ? AND timeframe = ?
+        WHERE symbol = ? AND timeframe = '1day'
         ORDER BY last_updated DESC LIMIT 1
         """,
-        (symbol, timeframe),
+        (symbol,),
       )
       row = cursor.fetchone()
       return row["last_updated"] if row else None
     finally:
       self.close()
 
-  def delete_intraday_bars(self, symbol: str, timeframe: str = "5min") -> int:
-    """Delete all intraday bars for a symbol/timeframe (used for cache invalidation)."""
+  def get_intraday_last_updated(self, symbol: str, timeframe: str = "5min") -> Optional[str]:
+    """Get the last_updated timestamp for intraday data of a symbol."""
     conn = self.connect()
     cursor = conn.cursor()
     try:
       cursor.execute(
-        "DELETE FROM price_bars WHERE symbol = ? AND timeframe = ?",
+        """
+        SELECT last_updated FROM price_bars
+        WHERE symbol = ? AND timeframe = ?
+        ORDER BY last_updated DESC LIMIT 1
+        """,
         (symbol, timeframe),
       )
-      deleted = cursor.rowcount
-      conn.commit()
-      return deleted
+      row = cursor.fetchone()
+      return row["last_updated"] if row else None
     finally:
       self.close()
 
@@ -754,6 +1054,24 @@ class DatabaseManager:
       finally:
           self.close()
 
+  def get_alternative_assets_for_ticker(self) -> List[dict]:
+      """Return all alternative assets plus the ticker tape's display_format."""
+      conn = self.connect()
+      cursor = conn.cursor()
+      try:
+          cursor.execute(
+              """
+              SELECT *,
+                CASE WHEN asset_type = 'currency' THEN 'decimal' ELSE 'currency' END
+                  AS display_format
+              FROM alternative_assets
+              """
+          )
+          rows = cursor.fetchall()
+          return [dict(row) for row in rows]
+      finally:
+          self.close()
+
   # ============================================================================
   # MACRO INDICATORS METHODS
   # ============================================================================
@@ -792,15 +1110,30 @@ class DatabaseManager:
     conn = self.connect()
     cursor = conn.cursor()
     try:
-      cursor.execute('''
-        INSERT OR REPLACE INTO treasury_history 
-        (date, yield_10y, yield_2y, last_updated)
-        VALUES (?, ?, ?, ?)
-      ''', (date, yield_10y, yield_2y, datetime.now().isoformat()))
+      cursor.execute(
+        self.TREASURY_UPSERT_SQL,
+        (date, yield_10y, yield_2y, datetime.now().isoformat()),
+      )
       conn.commit()
     finally:
       self.close()
 
+  def insert_treasury_history_bulk(self, rows: List[tuple]) -> int:
+    """
+    Insert many treasury yield rows in one transaction.
+    Each row: (date, yield_10y, yield_2y)
+    """
+    if not rows:
+      return 0
+    conn = self.connect()
+    now = datetime.now().isoformat()
+    try:
+      with conn:
+        conn.executemany(self.TREASURY_UPSERT_SQL, [(*row, now) for row in rows])
+      return len(rows)
+    finally:
+      self.close()
+
   def get_treasury_history(self, days: int = 365) -> List[dict]:
     """Get treasury yield history"""
     conn = self.connect()
@@ -817,21 +1150,60 @@ class DatabaseManager:
     finally:
       self.close()
 
+  def get_treasury_latest_with_change(self) -> Optional[dict]:
+    """Get latest treasury yields with day-over-day change computed in SQL"""
+    conn = self.connect()
+    cursor = conn.cursor()
+    try:
+      cursor.execute('''
+        SELECT
+          date, yield_10y, yield_2y,
+          ROUND(yield_10y - LAG(yield_10y) OVER w, 3) AS change_10y,
+          ROUND((yield_10y - LAG(yield_10y) OVER w) * 100.0
+                / NULLIF(LAG(yield_10y) OVER w, 0), 2) AS change_pct_10y,
+          ROUND(yield_2y - LAG(yield_2y) OVER w, 3) AS change_2y,
+          ROUND((yield_2y - LAG(yield_2y) OVER w) * 100.0
+                / NULLIF(LAG(yield_2y) OVER w, 0), 2) AS change_pct_2y
+        FROM treasury_history
+        WINDOW w AS (ORDER BY date)
+        ORDER BY date DESC
+        LIMIT 1
+      ''')
+      row = cursor.fetchone()
+      return dict(row) if row else None
+    finally:
+      self.close()
+
   def insert_cpi_history(self, date: str, cpi_value: float,
                          mom_change: float = None, yoy_change: float = None):
     """Insert CPI historical data"""
     conn = self.connect()
     cursor = conn.cursor()
     try:
-      cursor.execute('''
-        INSERT OR REPLACE INTO cpi_history 
-        (date, cpi_value, mom_change, yoy_change, last_updated)
-        VALUES (?, ?, ?, ?, ?)
-      ''', (date, cpi_value, mom_change, yoy_change, datetime.now().isoformat()))
+      cursor.execute(
+        self.CPI_UPSERT_SQL,
+        (date, cpi_value, mom_change, yoy_change, datetime.now().isoformat()),
+      )
       conn.commit()
     finally:
       self.close()
 
+  def insert_cpi_history_bulk(self, rows: List[tuple]) -> int:
+    """
+    Insert many CPI rows in one transaction.
+    Each row: (date, cpi_value, mom_change, yoy_change)
+    """
+    if not rows:
+      return 0
+    conn = self.connect()
+    now = datetime.now().isoformat()
+    try:
+      with conn:
+        conn.executemany(self.CPI_UPSERT_SQL, [(*row, now) for row in rows])
+      return len(rows)
+    finally:
+      self.close()
+
   def get_cpi_history(self, months: int = 12) -> List[dict]:
     """Get CPI history"""
     conn = self.connect()
@@ -855,15 +1227,30 @@ class DatabaseManager:
     conn = self.connect()
     cursor = conn.cursor()
     try:
-      cursor.execute('''
-        INSERT OR REPLACE INTO vix_history 
-        (date, vix_close, vix_high, vix_low, last_updated)
-        VALUES (?, ?, ?, ?, ?)
-      ''', (date, vix_close, vix_high, vix_low, datetime.now().isoformat()))
+      cursor.execute(
+        self.VIX_UPSERT_SQL,
+        (date, vix_close, vix_high, vix_low, datetime.now().isoformat()),
+      )
       conn.commit()
     finally:
       self.close()
 
+  def insert_vix_history_bulk(self, rows: List[tuple]) -> int:
+    """
+    Insert many VIX rows in one transaction.
+    Each row: (date, vix_close, vix_high, vix_low)
+    """
+    if not rows:
+      return 0
+    conn = self.connect()
+    now = datetime.now().isoformat()
+    try:
+      with conn:
+        conn.executemany(self.VIX_UPSERT_SQL, [(*row, now) for row in rows])
+      return len(rows)
+    finally:
+      self.close()
+
   def get_vix_history(self, days: int = 365) -> List[dict]:
     """Get VIX history"""
     conn = self.connect()
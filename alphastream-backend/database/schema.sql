@@ -255,6 +255,9 @@ CREATE TABLE IF NOT EXISTS price_bars (
 CREATE INDEX IF NOT EXISTS idx_market_movers_category ON market_movers(category);
 CREATE INDEX IF NOT EXISTS idx_earnings_report_date ON earnings_calendar(report_date);
 CREATE INDEX IF NOT EXISTS idx_news_ticker ON news_articles(ticker);
-CREATE INDEX IF NOT EXISTS idx_sector_perf_history_date ON sector_performance_history(date);
+-- Covers the summary's date-window scan (get_sector_history): rows come
+-- back in date order straight from the index, without table lookups
+CREATE INDEX IF NOT EXISTS idx_sector_perf_history_window
+    ON sector_performance_history(date, sector, average_change, exchange);
 CREATE INDEX IF NOT EXISTS idx_price_bars_symbol_timeframe ON price_bars(symbol, timeframe, bar_time);
 
@@ -1,9 +1,16 @@
 # AlphaStream API Backend - Updated 2026-01-13 - v2
+import logging
+import os
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 
+import orjson
+
 from fastapi import FastAPI, HTTPException, Query, Body
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 
 from clients.finnhub_client import FinnhubRateLimitError, finnhub
 from database.db_manager import db
@@ -16,6 +23,7 @@ from services.price_history_importer import (
     get_or_fetch_intraday,
     get_or_fetch_eod,
     compute_return_from_eod,
+    refresh_returns_bulk,
 )
 from services.earnings_importer import refresh_earnings_window
 from services.sector_importer import get_sector_performance_summary
@@ -25,6 +33,12 @@ LIVE_CACHE_SECONDS = 2
 _live_quote_cache: Dict[str, Dict] = {}
 from services.refresh_scheduler import is_market_hours
 
+# Importers log per-row detail at DEBUG; set LOG_LEVEL=DEBUG to see it.
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+
 app = FastAPI(
     title="AlphaStream API",
     description="Backend for AlphaStream Intelligence Terminal",
@@ -797,6 +811,9 @@ def get_watchlist_prices(tickers: str):
         if not tickers:
             return []
         ticker_list = [t.strip().upper() for t in tickers.split(",") if t.strip()]
+        # Refresh any stale EOD bars for the whole list at once so the 1W
+        # returns below read from the cache instead of one fetch per ticker
+        refresh_returns_bulk(ticker_list, window_days=7)
         results = []
         for t in ticker_list:
             stock = db.get_stock(t)
@@ -1378,6 +1395,32 @@ def get_index_intraday(symbol: str, interval: str = "5min"):
         raise HTTPException(status_code=500, detail=str(exc))
 
 
+# Profile fields returned by get_stock_profile, with defaults when FMP omits them
+# ("symbol" is handled separately since it falls back to the requested ticker)
+_PROFILE_FIELDS = (
+    ("companyName", ""),
+    ("description", ""),
+    ("image", ""),
+    ("ceo", ""),
+    ("sector", ""),
+    ("industry", ""),
+    ("website", ""),
+    ("exchange", ""),
+    ("exchangeFullName", ""),
+    ("marketCap", None),
+    ("averageVolume", None),
+    ("ipoDate", ""),
+    ("country", ""),
+    ("city", ""),
+    ("state", ""),
+    ("fullTimeEmployees", ""),
+    ("price", None),
+    ("beta", None),
+    ("lastDividend", None),
+    ("range", ""),
+)
+
+
 @app.get("/api/stock/{ticker}/profile")
 def get_stock_profile(ticker: str):
     """
@@ -1396,29 +1439,8 @@ def get_stock_profile(ticker: str):
         profile = profile_data[0]
         
         # Ensure all required fields are present (with defaults)
-        result = {
-            "symbol": profile.get("symbol", symbol),
-            "companyName": profile.get("companyName", ""),
-            "description": profile.get("description", ""),
-            "image": profile.get("image", ""),
-            "ceo": profile.get("ceo", ""),
-            "sector": profile.get("sector", ""),
-            "industry": profile.get("industry", ""),
-            "website": profile.get("website", ""),
-            "exchange": profile.get("exchange", ""),
-            "exchangeFullName": profile.get("exchangeFullName", ""),
-            "marketCap": profile.get("marketCap"),
-            "averageVolume": profile.get("averageVolume"),
-            "ipoDate": profile.get("ipoDate", ""),
-            "country": profile.get("country", ""),
-            "city": profile.get("city", ""),
-            "state": profile.get("state", ""),
-            "fullTimeEmployees": profile.get("fullTimeEmployees", ""),
-            "price": profile.get("price"),
-            "beta": profile.get("beta"),
-            "lastDividend": profile.get("lastDividend"),
-            "range": profile.get("range", ""),
-        }
+        result = {"symbol": profile.get("symbol", symbol)}
+        result.update({key: profile.get(key, default) for key, default in _PROFILE_FIELDS})
         
         print(f"[OK] Profile fetched for {symbol}: {result.get('companyName')}")
         return result
@@ -1545,20 +1567,45 @@ def get_all_financials(ticker: str, period: str = "annual", limit: int = 5):
 # SYSTEM / MONITORING
 # ============================================================================
 
-@app.get("/api/data/status")
-def get_data_status():
-    """Get database refresh status and data age"""
-    try:
-        age_minutes = db.get_data_age()
-        refresh_history = db.get_refresh_history(limit=5)
+STATUS_CACHE_SECONDS = 5
+_status_cache: Dict[bool, tuple] = {}
+_status_lock = threading.Lock()
+
+
+def _data_status(include_count: bool) -> Dict:
+    """
+    Shared payload for the data status endpoints.
+    One DB round-trip per 5s window; the lock makes concurrent pollers share it.
+    """
+    with _status_lock:
+        now = time.monotonic()
+        cached = _status_cache.get(include_count)
+        if cached and now - cached[0] < STATUS_CACHE_SECONDS:
+            return cached[1]
+
+        age_minutes, refresh_history, total_stocks = db.get_status_bundle(
+            include_count=include_count
+        )
         if age_minutes is None and refresh_history is None:
             raise HTTPException(status_code=503, detail="Data not available")
-        return {
+
+        payload = {
             "data_age_minutes": round(age_minutes, 2) if age_minutes else None,
-            "last_refresh": refresh_history if refresh_history else None,
             "recent_refreshes": refresh_history,
-            "total_stocks": len(db.get_all_stocks()),
         }
+        if include_count:
+            payload["last_refresh"] = refresh_history if refresh_history else None
+            payload["total_stocks"] = total_stocks
+
+        _status_cache[include_count] = (now, payload)
+        return payload
+
+
+@app.get("/api/data/status")
+def get_data_status():
+    """Get database refresh status and data age"""
+    try:
+        return _data_status(include_count=True)
     except HTTPException:
         raise
     except Exception as e:
@@ -1599,6 +1646,31 @@ def get_macro_indicators():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _json_rows(rows: List[dict], transform=None) -> Response:
+    """Encode history rows (optionally reshaped) with orjson in one call."""
+    if transform is not None:
+        rows = [transform(row) for row in rows]
+    return Response(orjson.dumps(rows), media_type="application/json")
+
+
+def _cpi_row(item: dict) -> dict:
+    return {
+        "date": item["date"],
+        "cpi_value": item.get("cpi_value"),
+        "mom_change": item.get("mom_change"),
+        "yoy_change": item.get("yoy_change"),
+    }
+
+
+def _vix_row(item: dict) -> dict:
+    return {
+        "date": item["date"],
+        "vix_value": item.get("vix_close"),
+        "vix_high": item.get("vix_high"),
+        "vix_low": item.get("vix_low"),
+    }
+
+
 @app.get("/api/macro/treasury-history")
 def get_treasury_history(days: int = 365):
     """Get 12 months of US 10Y and 2Y treasury yield history for chart"""
@@ -1606,7 +1678,7 @@ def get_treasury_history(days: int = 365):
         history = db.get_treasury_history(days=days)
         if not history:
             raise HTTPException(status_code=503, detail="Data not available")
-        return history
+        return _json_rows(history)
     except HTTPException:
         raise
     except Exception as e:
@@ -1621,15 +1693,7 @@ def get_cpi_history(months: int = 12):
         history = db.get_cpi_history(months=months)
         if not history:
             raise HTTPException(status_code=503, detail="Data not available")
-        return [
-            {
-                "date": item["date"],
-                "cpi_value": item.get("cpi_value"),
-                "mom_change": item.get("mom_change"),
-                "yoy_change": item.get("yoy_change"),
-            }
-            for item in history
-        ]
+        return _json_rows(history, _cpi_row)
     except HTTPException:
         raise
     except Exception as e:
@@ -1644,15 +1708,7 @@ def get_vix_history(days: int = 365):
         history = db.get_vix_history(days=days)
         if not history:
             raise HTTPException(status_code=503, detail="Data not available")
-        return [
-            {
-                "date": item["date"],
-                "vix_value": item.get("vix_close"),
-                "vix_high": item.get("vix_high"),
-                "vix_low": item.get("vix_low"),
-            }
-            for item in history
-        ]
+        return _json_rows(history, _vix_row)
     except HTTPException:
         raise
     except Exception as e:
@@ -1664,14 +1720,7 @@ def get_vix_history(days: int = 365):
 def get_data_status_summary():
     """Get database refresh status (summary)"""
     try:
-        age_minutes = db.get_data_age()
-        refresh_history = db.get_refresh_history(limit=5)
-        if age_minutes is None and refresh_history is None:
-            raise HTTPException(status_code=503, detail="Data not available")
-        return {
-            "data_age_minutes": round(age_minutes, 2) if age_minutes else None,
-            "recent_refreshes": refresh_history,
-        }
+        return _data_status(include_count=False)
     except HTTPException:
         raise
     except Exception as e:
@@ -1718,15 +1767,15 @@ async def get_ticker_all():
 
         # Market indices
         try:
-            indices = db.get_all_indices()
+            indices = db.get_index_rows()
             for idx in indices:
                 ticker_items.append(
                     {
-                        "symbol": idx.get("symbol"),
-                        "name": idx.get("name"),
-                        "value": idx.get("value"),
-                        "change": idx.get("change"),
-                        "changePercent": idx.get("change_pct") or idx.get("change_percent"),
+                        "symbol": idx.symbol,
+                        "name": idx.name,
+                        "value": idx.value,
+                        "change": idx.change,
+                        "changePercent": idx.change_pct,
                         "category": "equity",
                         "displayFormat": "decimal",
                         "error": None,
@@ -1737,48 +1786,39 @@ async def get_ticker_all():
 
         # Treasury yields (US10Y, US2Y)
         try:
-            treasury = db.get_treasury_history(days=2)
-            if treasury and len(treasury) >= 2:
-                latest = treasury[-1]
-                prev = treasury[-2]
-
-                if latest.get("yield_10y") is not None and prev.get("yield_10y") is not None:
-                    us10y_change = latest["yield_10y"] - prev["yield_10y"]
-                    us10y_change_pct = (us10y_change / prev["yield_10y"]) * 100 if prev["yield_10y"] else None
-                    ticker_items.append(
-                        {
-                            "symbol": "US10Y",
-                            "name": "10-Year Treasury",
-                            "value": latest["yield_10y"],
-                            "change": round(us10y_change, 3) if us10y_change is not None else None,
-                            "changePercent": round(us10y_change_pct, 2) if us10y_change_pct is not None else None,
-                            "category": "macro",
-                            "displayFormat": "percent",
-                            "error": None,
-                        }
-                    )
-
-                if latest.get("yield_2y") is not None and prev.get("yield_2y") is not None:
-                    us2y_change = latest["yield_2y"] - prev["yield_2y"]
-                    us2y_change_pct = (us2y_change / prev["yield_2y"]) * 100 if prev["yield_2y"] else None
-                    ticker_items.append(
-                        {
-                            "symbol": "US2Y",
-                            "name": "2-Year Treasury",
-                            "value": latest["yield_2y"],
-                            "change": round(us2y_change, 3) if us2y_change is not None else None,
-                            "changePercent": round(us2y_change_pct, 2) if us2y_change_pct is not None else None,
-                            "category": "macro",
-                            "displayFormat": "percent",
-                            "error": None,
-                        }
-                    )
+            treasury = db.get_treasury_latest_with_change()
+            if treasury and treasury["change_10y"] is not None:
+                ticker_items.append(
+                    {
+                        "symbol": "US10Y",
+                        "name": "10-Year Treasury",
+                        "value": treasury["yield_10y"],
+                        "change": treasury["change_10y"],
+                        "changePercent": treasury["change_pct_10y"],
+                        "category": "macro",
+                        "displayFormat": "percent",
+                        "error": None,
+                    }
+                )
+            if treasury and treasury["change_2y"] is not None:
+                ticker_items.append(
+                    {
+                        "symbol": "US2Y",
+                        "name": "2-Year Treasury",
+                        "value": treasury["yield_2y"],
+                        "change": treasury["change_2y"],
+                        "changePercent": treasury["change_pct_2y"],
+                        "category": "macro",
+                        "displayFormat": "percent",
+                        "error": None,
+                    }
+                )
         except Exception as e:
             print(f"[ERROR] Failed to fetch treasury data for ticker: {e}")
 
         # Alternative assets (crypto, commodities, currencies)
         try:
-            alt_assets = db.get_all_alternative_assets()
+            alt_assets = db.get_alternative_assets_for_ticker()
             for asset in alt_assets:
                 ticker_items.append(
                     {
@@ -1788,7 +1828,7 @@ async def get_ticker_all():
                         "change": asset.get("change"),
                         "changePercent": asset.get("change_percent"),
                         "category": asset.get("asset_type"),
-                        "displayFormat": "currency" if asset.get("asset_type") != "currency" else "decimal",
+                        "displayFormat": asset["display_format"],
                         "error": asset.get("fetch_error"),
                     }
                 )
@@ -2233,7 +2273,16 @@ def get_analyst_grades(ticker: str, limit: int = 30):
 
 
 if __name__ == "__main__":
+    import sys
+
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop is POSIX-only; both it and httptools ship with uvicorn[standard]
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+    )
 
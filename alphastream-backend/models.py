@@ -1,6 +1,7 @@
-from typing import Dict, List, Literal, Optional
+from dataclasses import field
+from typing import Dict, List, Literal, Optional, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic.dataclasses import dataclass
 
 Sector = str
 CatalystTag = str
@@ -9,7 +10,9 @@ MarketRegime = Literal["Risk-On", "Risk-Off", "Neutral"]
 MarketStatus = Literal["Open", "Closed", "Pre-Market", "After-Hours"]
 
 
-class Stock(BaseModel):
+# slots: the universe holds ~500 of these; no per-instance __dict__
+@dataclass(kw_only=True, slots=True)
+class Stock:
     ticker: str
     name: str
     sector: Sector
@@ -46,12 +49,13 @@ class Stock(BaseModel):
     earningsGrowth: float = 0.0
     fcfYield: float = 0.0
 
-    catalysts: List[CatalystTag] = Field(default_factory=list)
+    catalysts: List[CatalystTag] = field(default_factory=list)
     weight: float = 0.0
     updatedAt: str
 
 
-class MarketIndex(BaseModel):
+@dataclass(kw_only=True)
+class MarketIndex:
     symbol: str
     name: str
     value: float
@@ -59,7 +63,8 @@ class MarketIndex(BaseModel):
     changePercent: float
 
 
-class CryptoPrice(BaseModel):
+@dataclass(kw_only=True)
+class CryptoPrice:
     symbol: str
     name: str
     price: float
@@ -68,7 +73,8 @@ class CryptoPrice(BaseModel):
     marketCap: float
 
 
-class MacroIndicator(BaseModel):
+@dataclass(kw_only=True)
+class MacroIndicator:
     name: str
     value: float
     previousValue: float
@@ -77,7 +83,8 @@ class MacroIndicator(BaseModel):
     lastUpdated: str
 
 
-class SectorPerformance(BaseModel):
+@dataclass(kw_only=True)
+class SectorPerformance:
     sector: Sector
     change1D: float
     change1W: float = 0.0
@@ -85,7 +92,8 @@ class SectorPerformance(BaseModel):
     change1Y: float = 0.0
 
 
-class MarketState(BaseModel):
+@dataclass(kw_only=True)
+class MarketState:
     status: MarketStatus
     regime: MarketRegime
     regimeProbabilities: Dict[str, float]
@@ -96,7 +104,9 @@ class MarketState(BaseModel):
     lastUpdated: str
 
 
-class PortfolioHolding(BaseModel):
+# frozen: get_mock_portfolio shares one cached instance across requests
+@dataclass(kw_only=True, frozen=True)
+class PortfolioHolding:
     ticker: str
     name: str
     sector: Sector
@@ -112,10 +122,11 @@ class PortfolioHolding(BaseModel):
     strategy: StrategyTag
 
 
-class Portfolio(BaseModel):
+@dataclass(kw_only=True, frozen=True)
+class Portfolio:
     id: str
     name: str
-    holdings: List[PortfolioHolding]
+    holdings: Tuple[PortfolioHolding, ...]
     totalValue: float
     totalCost: float
     cash: float
@@ -129,7 +140,8 @@ class Portfolio(BaseModel):
     lastUpdated: str
 
 
-class MarketNewsItem(BaseModel):
+@dataclass(kw_only=True)
+class MarketNewsItem:
     id: str
     headline: str
     summary: str
@@ -137,5 +149,5 @@ class MarketNewsItem(BaseModel):
     publishedAt: str
     category: str
     sentiment: Literal["bullish", "bearish", "neutral"] = "neutral"
-    tickers: List[str] = Field(default_factory=list)
+    tickers: List[str] = field(default_factory=list)
     url: Optional[str] = None
@@ -2,7 +2,7 @@
 """Fix emojis in Python files that cause Windows encoding issues."""
 
 import os
-import glob
+import re
 
 # Files to fix
 files_to_fix = [
@@ -16,14 +16,18 @@ files_to_fix = [
     "services/macro_importer.py",
 ]
 
-# Emoji replacements
+# Emoji replacements (UTF-8 byte sequences -> ASCII tags)
 replacements = {
-    "\u2705": "[OK]",      # ✅
-    "\u274c": "[ERROR]",   # ❌
-    "\u26a0": "[WARN]",    # ⚠
-    "\U0001f504": "[REFRESH]",  # 🔄
-    "\U0001f4ca": "[DATA]",     # 📊
+    "\u2705".encode(): b"[OK]",      # ✅
+    "\u274c".encode(): b"[ERROR]",   # ❌
+    "\u26a0".encode(): b"[WARN]",    # ⚠
+    "\U0001f504".encode(): b"[REFRESH]",  # 🔄
+    "\U0001f4ca".encode(): b"[DATA]",     # 📊
 }
+# Single-pass matcher over raw bytes (no UTF-8 decode needed). This is a
+# regex rather than bytes.translate: translate maps one byte to one byte,
+# and each emoji here is a multi-byte UTF-8 sequence (3-4 bytes).
+pattern = re.compile(b"|".join(re.escape(emoji) for emoji in replacements))
 
 # Get the script directory
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -36,15 +40,13 @@ for file_path in files_to_fix:
         continue
     
     try:
-        with open(full_path, "r", encoding="utf-8") as f:
+        with open(full_path, "rb") as f:
             content = f.read()
-        
-        new_content = content
-        for emoji, replacement in replacements.items():
-            new_content = new_content.replace(emoji, replacement)
-        
+
+        new_content = pattern.sub(lambda m: replacements[m.group()], content)
+
         if new_content != content:
-            with open(full_path, "w", encoding="utf-8") as f:
+            with open(full_path, "wb") as f:
                 f.write(new_content)
             print(f"Fixed: {file_path}")
         else:
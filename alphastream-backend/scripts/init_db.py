@@ -1,5 +1,13 @@
-"""Initialize database with S&P 500 data and macro data"""
+"""Initialize database with S&P 500 data and macro data
+
+Usage: python scripts/init_db.py [--force-refresh]
+  --force-refresh  refetch the S&P 500 constituent list instead of using
+                   the weekly disk cache in .cache/
+"""
+import logging
+import os
 import sys
+from functools import partial
 from pathlib import Path
 
 # Add parent directory to path to import modules
@@ -13,6 +21,11 @@ from services.hybrid_importer import (
     fetch_and_import_market_movers_from_fmp,
 )
 from services.macro_importer import initialize_all_macro_data
+from utils.concurrency import run_importers
+
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(message)s")
+
+force_refresh = "--force-refresh" in sys.argv[1:]
 
 print("=" * 60)
 print("AlphaStream Intelligence Terminal - Database Setup")
@@ -27,43 +40,35 @@ db.init_database()
 print(f"Database initialized at {db.db_path}")
 
 # ============================================================================
-# STEP 2: IMPORT S&P 500 DATA (HYBRID)
+# STEPS 2-5: S&P 500 (HYBRID), INDICES, SECTORS, MOVERS (CONCURRENT)
 # ============================================================================
-
-print("\nStep 2: Importing S&P 500 stocks (Hybrid: SP500Live + FMP)...")
-stocks_count = fetch_and_import_sp500_hybrid()
+# Each importer is an independent batch of network calls writing its own
+# table, so run them side by side instead of back to back.
+
+print("\nSteps 2-5: Importing stocks, indices, sectors and movers concurrently...")
+counts = run_importers({
+    "stocks": partial(fetch_and_import_sp500_hybrid, force_refresh),
+    "indices": fetch_and_import_indices_from_fmp,
+    "sectors": fetch_and_import_sector_performance_from_fmp,
+    "movers": partial(fetch_and_import_market_movers_from_fmp, 10),
+})
+
+stocks_count = counts["stocks"]
+indices_count = counts["indices"]
+sectors_count = counts["sectors"]
+movers_count = counts["movers"]
 
 if stocks_count > 0:
     print(f"{stocks_count} stocks imported successfully")
 else:
     print("Warning: No stocks were imported")
 
-# ============================================================================
-# STEP 3: IMPORT MARKET INDICES (FMP)
-# ============================================================================
-
-print("\nStep 3: Importing market indices...")
-indices_count = fetch_and_import_indices_from_fmp()
 if indices_count == 0:
     print("  FMP failed, trying yfinance...")
     from services.hybrid_importer import fetch_and_import_indices_from_yfinance
 
     indices_count = fetch_and_import_indices_from_yfinance()
 
-# ============================================================================
-# STEP 4: CALCULATE SECTOR PERFORMANCE
-# ============================================================================
-
-print("\nStep 4: Importing sector performance from FMP...")
-sectors_count = fetch_and_import_sector_performance_from_fmp()
-
-# ============================================================================
-# STEP 5: CALCULATE MARKET MOVERS
-# ============================================================================
-
-print("\nStep 5: Importing market movers from FMP...")
-movers_count = fetch_and_import_market_movers_from_fmp(limit=10)
-
 # ============================================================================
 # STEP 6: IMPORT MACRO ECONOMIC DATA (FRED / existing)
 # ============================================================================
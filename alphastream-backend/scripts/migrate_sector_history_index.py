@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Migration script to replace the sector_performance_history date index with
+the covering window index from schema.sql.
+Run this once to update existing databases.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database.db_manager import db
+
+def migrate():
+    """Create idx_sector_perf_history_window and drop the index it supersedes."""
+    conn = db.connect()
+    cursor = conn.cursor()
+
+    try:
+        print("Creating covering index on sector_performance_history...")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_sector_perf_history_window "
+            "ON sector_performance_history(date, sector, average_change, exchange)"
+        )
+        # The (date) index is a prefix of the new one
+        cursor.execute("DROP INDEX IF EXISTS idx_sector_perf_history_date")
+        conn.commit()
+        print("\n[OK] Migration completed successfully!")
+
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        conn.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Sector History Index Migration")
+    print("=" * 50)
+    migrate()
@@ -2,46 +2,52 @@
 Earnings importer using FMP stable earnings-calendar endpoint.
 """
 
+import logging
 from datetime import datetime
 from typing import List, Optional
 
 from database.db_manager import db
 from services.fmp_client import fmp_client
 
+logger = logging.getLogger(__name__)
+
 
 def refresh_earnings_window(from_date: str, to_date: str, tickers: Optional[List[str]] = None) -> int:
     """
     Fetch earnings calendar for date range and upsert to DB.
     tickers (optional): if provided, filter to those symbols after fetch.
     """
+    ticker_set = frozenset(tickers) if tickers else None
     try:
         data = fmp_client.get_earnings_calendar_range(from_date, to_date)
         if not data:
-            print(f"[ERROR] No earnings data for window {from_date} -> {to_date}")
+            logger.warning("No earnings data for window %s -> %s", from_date, to_date)
             return 0
 
-        inserted = 0
+        rows = []
         for row in data:
             symbol = row.get("symbol")
             if not symbol:
                 continue
-            if tickers and symbol not in tickers:
+            if ticker_set is not None and symbol not in ticker_set:
                 continue
-            db.insert_or_update_earning(
-                ticker=symbol,
-                company_name=row.get("company", "") or row.get("name", ""),
-                report_date=row.get("date"),
-                fiscal_period="",
-                eps_estimate=row.get("epsEstimated"),
-                eps_actual=row.get("epsActual"),
-                revenue_estimate=row.get("revenueEstimated"),
-                revenue_actual=row.get("revenueActual"),
-                time="",
+            rows.append(
+                (
+                    symbol,
+                    row.get("company", "") or row.get("name", ""),
+                    row.get("date"),
+                    "",
+                    row.get("epsEstimated"),
+                    row.get("epsActual"),
+                    row.get("revenueEstimated"),
+                    row.get("revenueActual"),
+                    "",
+                )
             )
-            inserted += 1
-        print(f"[OK] Earnings upserted: {inserted} rows for {from_date} -> {to_date}")
+        inserted = db.insert_or_update_earnings_bulk(rows)
+        logger.info("Earnings upserted: %d rows for %s -> %s", inserted, from_date, to_date)
         return inserted
     except Exception as exc:
-        print(f"[ERROR] Earnings refresh failed: {exc}")
+        logger.error("Earnings refresh failed: %s", exc)
         return 0
 
@@ -3,52 +3,223 @@ Financial Modeling Prep API client.
 """
 
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
-import requests
+import httpx
+import ijson
+import simdjson
 from dotenv import load_dotenv
 
+from utils.cache import TTLCache
+
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(dotenv_path=BASE_DIR / ".env")
 
+# Symbols per multi-symbol quote call, and max in-flight calls in get_batch_quotes
+QUOTE_CHUNK_SIZE = 100
+BATCH_QUOTE_CONCURRENCY = 20
+
+# (output key, FMP quote key, default) for FMPClient._shape_quote
+QUOTE_FIELDS = (
+    ("symbol", "symbol", None),
+    ("name", "name", None),
+    ("price", "price", 0),
+    ("change", "change", 0),
+    ("changesPercentage", "changePercentage", 0),
+    ("volume", "volume", None),
+    ("dayLow", "dayLow", None),
+    ("dayHigh", "dayHigh", None),
+    ("yearHigh", "yearHigh", None),
+    ("yearLow", "yearLow", None),
+    ("marketCap", "marketCap", None),
+    ("priceAvg50", "priceAvg50", None),
+    ("priceAvg200", "priceAvg200", None),
+    ("open", "open", None),
+    ("previousClose", "previousClose", None),
+    ("exchange", "exchange", None),
+    ("timestamp", "timestamp", None),
+)
+
+# Transient statuses retried by _fetch (with exponential backoff)
+RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3
+
+# Response cache TTLs (seconds) for idempotent endpoints; unlisted endpoints
+# (quotes, news, intraday charts, ...) always hit the network.
+RESPONSE_CACHE_TTLS = {
+    "/stable/profile": 86400,
+    "/stable/income-statement": 3600,
+    "/stable/balance-sheet-statement": 3600,
+    "/stable/cash-flow-statement": 3600,
+    "/stable/key-metrics": 3600,
+    "/stable/ratios": 3600,
+    "/stable/biggest-gainers": 60,
+    "/stable/biggest-losers": 60,
+    "/stable/sector-performance-snapshot": 60,
+}
+# Cached parameter sets kept per endpoint
+RESPONSE_CACHE_MAX_ENTRIES = 512
+
+# simdjson parsers reuse one internal buffer and are not thread-safe;
+# get_batch_quotes runs chunks on a pool, so keep one parser per thread.
+_parser_local = threading.local()
+
+
+def _simdjson_parser() -> simdjson.Parser:
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None:
+        parser = _parser_local.parser = simdjson.Parser()
+    return parser
+
 
 class FMPClient:
     """Financial Modeling Prep API Client"""
 
     BASE_URL = "https://financialmodelingprep.com/api/v3"
+    STABLE_BASE_URL = "https://financialmodelingprep.com"
 
     def __init__(self) -> None:
         self.api_key = os.getenv("FMP_API_KEY")
         if not self.api_key:
             raise ValueError("FMP_API_KEY not found in .env file")
+        self._api_params = {"apikey": self.api_key}
+
+        # Shared HTTP/2 client: concurrent calls from get_batch_quotes' threads
+        # are multiplexed over one keep-alive TLS connection.
+        # The transport retries failed connects; status retries are in _fetch.
+        self.client = httpx.Client(
+            # br needs the brotli extra (httpx[brotli]); httpx decodes all three
+            headers={
+                "User-Agent": "alphastream/1.0",
+                "Accept": "application/json",
+                "Accept-Encoding": "gzip, deflate, br",
+            },
+            timeout=10.0,
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=MAX_RETRIES,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            ),
+        )
+
+        # One bounded TTLCache per cached endpoint, keyed by params. The
+        # params come from public routes (ticker, period, limit), so
+        # max_size caps what clients can make us hold.
+        self._caches = {
+            endpoint: TTLCache(ttl, max_size=RESPONSE_CACHE_MAX_ENTRIES)
+            for endpoint, ttl in RESPONSE_CACHE_TTLS.items()
+        }
+
+    def invalidate(self, prefix: str = "") -> None:
+        """Drop cached responses whose endpoint starts with prefix (all by default)."""
+        for endpoint, cache in self._caches.items():
+            if endpoint.startswith(prefix):
+                cache.clear()
 
     def _make_request(self, endpoint: str, params: Optional[dict] = None) -> dict:
         """
         Make API request to FMP.
         Handles both /v3/ (legacy) and /stable/ endpoints.
+        Responses for endpoints in RESPONSE_CACHE_TTLS are served from memory
+        while fresh; every caller gets the same object, so callers must not
+        mutate the result.
         """
         params = params or {}
-        params["apikey"] = self.api_key
-
+        cache = self._caches.get(endpoint)
+        if cache is not None:
+            cache_key = tuple(sorted(params.items()))
+            cached, stale = cache.get(cache_key)
+            if cached is not None and not stale:
+                return cached
+
+        data = self._fetch(endpoint, params)
+        if cache is not None:
+            cache.set(cache_key, data)
+        return data
+
+    def _url(self, endpoint: str) -> str:
         # Stable endpoints live under https://financialmodelingprep.com/stable/...
         # (no /api prefix), while legacy endpoints are under /api/v3.
         if endpoint.startswith("/stable/"):
-            url = f"https://financialmodelingprep.com{endpoint}"
-        else:
-            url = f"{self.BASE_URL}{endpoint}"
+            return self.STABLE_BASE_URL + endpoint
+        return self.BASE_URL + endpoint
+
+    def _with_key(self, params: dict) -> dict:
+        """Outgoing params with the API key, without mutating the caller's dict."""
+        return {**params, **self._api_params} if params else self._api_params
+
+    def _get(self, endpoint: str, params: dict) -> httpx.Response:
+        """HTTP GET against FMP, retrying RETRY_STATUSES with backoff."""
+        params = self._with_key(params)
+        url = self._url(endpoint)
 
         try:
-            response = requests.get(url, params=params, timeout=10)
+            for attempt in range(MAX_RETRIES + 1):
+                response = self.client.get(url, params=params)
+                if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                    break
+                time.sleep(RETRY_BACKOFF * (2 ** attempt))
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as exc:
+            return response
+        except httpx.HTTPError as exc:
             print(f"[FMP] Error calling {endpoint}: {exc}")
             raise
 
+    def _fetch(self, endpoint: str, params: dict) -> dict:
+        """Perform the HTTP GET against FMP and decode the JSON body."""
+        return self._get(endpoint, params).json()
+
+    def _make_request_stream(
+        self,
+        endpoint: str,
+        params: Optional[dict] = None,
+        item_prefix: str = "item",
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict]:
+        """
+        Stream-parse a JSON response with ijson, yielding objects under
+        item_prefix ("item" = elements of a top-level array) as bytes arrive.
+        Stops reading (and closes the response) after limit items.
+        Not cached and not retried; use _make_request for that.
+        """
+        params = self._with_key(params or {})
+        items = ijson.sendable_list()
+        parser = ijson.items_coro(items, item_prefix, use_float=True)
+        count = 0
+
+        try:
+            with self.client.stream("GET", self._url(endpoint), params=params) as response:
+                response.raise_for_status()
+                for chunk in response.iter_bytes():
+                    parser.send(chunk)
+                    for item in items:
+                        yield item
+                        count += 1
+                        if limit and count >= limit:
+                            return
+                    del items[:]
+            parser.close()
+            for item in items:
+                yield item
+                count += 1
+                if limit and count >= limit:
+                    return
+        except httpx.HTTPError as exc:
+            print(f"[FMP] Error streaming {endpoint}: {exc}")
+            raise
+
     # ========= STOCK QUOTES =========
+    @staticmethod
+    def _shape_quote(item: Dict) -> Dict:
+        """Map a raw FMP quote object to the fields the app uses."""
+        return {out: item.get(src, default) for out, src, default in QUOTE_FIELDS}
+
     def get_quote(self, symbol: str) -> Optional[Dict]:
         """
         Get real-time quote for a single stock using stable /quote.
@@ -58,51 +229,88 @@ class FMPClient:
             data = self._make_request("/stable/quote", params={"symbol": symbol})
             if not isinstance(data, list) or not data:
                 return None
-
-            item = data[0]
-            return {
-                "symbol": item.get("symbol"),
-                "name": item.get("name"),
-                "price": item.get("price", 0),
-                "change": item.get("change", 0),
-                "changesPercentage": item.get("changePercentage", 0),
-                "volume": item.get("volume"),
-                "dayLow": item.get("dayLow"),
-                "dayHigh": item.get("dayHigh"),
-                "yearHigh": item.get("yearHigh"),
-                "yearLow": item.get("yearLow"),
-                "marketCap": item.get("marketCap"),
-                "priceAvg50": item.get("priceAvg50"),
-                "priceAvg200": item.get("priceAvg200"),
-                "open": item.get("open"),
-                "previousClose": item.get("previousClose"),
-                "exchange": item.get("exchange"),
-                "timestamp": item.get("timestamp"),
-            }
+            return self._shape_quote(data[0])
         except Exception as e:
             print(f"[FMP] Error getting quote for {symbol}: {e}")
             return None
 
+    def _get_quote_chunk(self, symbols: List[str]) -> List[Dict]:
+        """
+        Quotes for up to QUOTE_CHUNK_SIZE symbols in one call.
+        Example: https://financialmodelingprep.com/stable/batch-quote?symbols=AAPL,MSFT
+        The body is parsed lazily with simdjson and only QUOTE_FIELDS are
+        read off each object, so the unused keys are never decoded.
+        Falls back to single-symbol calls if the batch endpoint fails or
+        returns no quotes (e.g. an error object instead of an array).
+        """
+        try:
+            response = self._get("/stable/batch-quote", {"symbols": ",".join(symbols)})
+            doc = _simdjson_parser().parse(response.content)
+            # _shape_quote copies scalars out as Python natives, so nothing
+            # references the parser's buffer once the next parse() reuses it
+            data = (
+                [self._shape_quote(item) for item in doc if isinstance(item, simdjson.Object)]
+                if isinstance(doc, simdjson.Array)
+                else None
+            )
+        except Exception as e:
+            print(f"[FMP] Batch quote failed ({e}), falling back to single quotes")
+            data = None
+
+        if data:
+            return data
+        quotes = (self.get_quote(symbol) for symbol in symbols)
+        return [quote for quote in quotes if quote]
+
+    @staticmethod
+    def _quote_chunks(symbols: List[str]) -> List[List[str]]:
+        return [
+            symbols[i : i + QUOTE_CHUNK_SIZE]
+            for i in range(0, len(symbols), QUOTE_CHUNK_SIZE)
+        ]
+
     def get_batch_quotes(self, symbols: List[str]) -> List[Dict]:
         """
-        Get quotes for multiple stocks by aggregating single-symbol calls.
+        Get quotes for multiple stocks using multi-symbol calls of
+        QUOTE_CHUNK_SIZE symbols, with chunks fetched concurrently.
         """
         if not symbols:
             return []
 
-        results: List[Dict] = []
-        for symbol in symbols:
-            quote = self.get_quote(symbol)
-            if quote:
-                results.append(quote)
-            time.sleep(0.05)
-        return results
+        chunks = self._quote_chunks(symbols)
+        workers = min(BATCH_QUOTE_CONCURRENCY, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return [
+                quote
+                for chunk in executor.map(self._get_quote_chunk, chunks)
+                for quote in chunk
+            ]
+
+    def iter_batch_quotes(self, symbols: List[str]) -> Iterator[List[Dict]]:
+        """
+        Like get_batch_quotes, but yields each chunk's quotes as soon as it
+        arrives (completion order) so callers can process one chunk while
+        the rest are still in flight.
+        """
+        if not symbols:
+            return
+
+        chunks = self._quote_chunks(symbols)
+        workers = min(BATCH_QUOTE_CONCURRENCY, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._get_quote_chunk, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                yield future.result()
 
     # ========= NEWS (STABLE) =========
     def get_general_latest_news(self, page: int = 0, limit: int = 20) -> List[Dict]:
-        """General market news feed."""
-        return self._make_request(
-            "/stable/news/general-latest", params={"page": page, "limit": limit}
+        """General market news feed (stream-parsed, at most limit articles)."""
+        return list(
+            self._make_request_stream(
+                "/stable/news/general-latest",
+                params={"page": page, "limit": limit},
+                limit=limit,
+            )
         )
 
     def get_stock_latest_news(self, page: int = 0, limit: int = 20) -> List[Dict]:
@@ -138,7 +346,9 @@ class FMPClient:
         endpoint = "/stable/historical-price-eod/full"
         params = {"symbol": symbol}
         if limit:
+            # Newest bars come first: stop parsing once we have enough
             params["limit"] = limit
+            return list(self._make_request_stream(endpoint, params=params, limit=limit))
         return self._make_request(endpoint, params=params)
     # ========= MARKET SNAPSHOTS =========
     def get_sector_performance_snapshot(self, date: str = None, exchange: str = None) -> List[Dict]:
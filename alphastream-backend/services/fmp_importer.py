@@ -2,149 +2,207 @@
 FMP Data Importer - Fetches data from FMP and stores in the database.
 """
 
+import logging
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
-from database.db_manager import db
+import pandas as pd
+
+from database.db_manager import STOCK_COLUMNS, db
 from services.fmp_client import fmp_client
+from utils.cache import disk_cached
+from utils.concurrency import run_importers
 
+logger = logging.getLogger(__name__)
 
-BATCH_SIZE = 40
 
+_STRIP_PERCENT = str.maketrans("", "", "%+")
 
-def _to_float(value: Optional[float], default: float = 0.0) -> float:
+
+def _parse_float(value, default: float = 0.0) -> float:
     try:
         return float(value)
     except (TypeError, ValueError):
         return default
 
 
+def _to_float(value: Optional[float], default: float = 0.0) -> float:
+    # JSON numbers are almost always float/int already; skip the try/except
+    value_type = type(value)
+    if value_type is float:
+        return value
+    if value_type is int:
+        return float(value)
+    if value is None:
+        return default
+    return _parse_float(value, default)
+
+
 def _clean_change_percent(value: Optional[str | float]) -> float:
     if value is None:
         return 0.0
-    if isinstance(value, str):
-        return _to_float(value.replace("%", "").replace("+", ""))
+    if type(value) is str:
+        return _parse_float(value.translate(_STRIP_PERCENT))
     return _to_float(value)
 
 
-def _build_stock_payload(quote: Dict, constituent: Optional[Dict]) -> Dict:
-    """Map FMP quote + constituent data into our stocks schema."""
-    sector = constituent.get("sector", "") if constituent else ""
-    subsector = constituent.get("subSector", "") if constituent else ""
-    founded = constituent.get("founded") if constituent else None
-
-    return {
-        # Identifiers
-        "ticker": quote.get("symbol", "").upper(),
-        "name": quote.get("name", "") or quote.get("symbol", ""),
-        "sector": sector,
-        "industry": subsector,
-        # Price & performance
-        "price": _to_float(quote.get("price")),
-        "change_1d": _clean_change_percent(quote.get("changesPercentage")),
-        "change_1w": 0.0,
-        "change_1m": 0.0,
-        "change_1y": 0.0,
-        "change_5y": 0.0,
-        "change_ytd": 0.0,
-        # Volume
-        "volume": int(_to_float(quote.get("volume"), 0)),
-        # High/Low
-        "high_1d": _to_float(quote.get("dayHigh")),
-        "low_1d": _to_float(quote.get("dayLow")),
-        "high_1m": None,
-        "low_1m": None,
-        "high_1y": _to_float(quote.get("yearHigh")),
-        "low_1y": _to_float(quote.get("yearLow")),
-        "high_5y": None,
-        "low_5y": None,
-        # Valuation
-        "pe_ratio": _to_float(quote.get("pe"), None),
-        "eps": _to_float(quote.get("eps"), None),
-        "dividend_yield": 0.0,
-        "market_cap": _to_float(quote.get("marketCap")),
-        "shares_outstanding": _to_float(quote.get("sharesOutstanding"), None),
-        # Profitability / balance sheet placeholders
-        "net_profit_margin": 0.0,
-        "gross_margin": 0.0,
-        "roe": 0.0,
-        "revenue_ttm": None,
-        "beta": None,
-        "institutional_ownership": None,
-        "debt_to_equity": None,
-        # Company info
-        "year_founded": int(founded) if founded else None,
-        "website": None,
-        "city": None,
-        "state": None,
-        "zip": None,
-        "weight": 0.0,
-        # Metadata
-        "last_updated": datetime.now().isoformat(),
-        "data_source": "fmp",
-        "is_sp500": 1,
-    }
-
-
-def fetch_and_import_sp500_from_fmp() -> int:
+_QUOTE_NUMERIC_COLUMNS = [
+    "price",
+    "volume",
+    "dayHigh",
+    "dayLow",
+    "yearHigh",
+    "yearLow",
+    "pe",
+    "eps",
+    "marketCap",
+    "sharesOutstanding",
+]
+
+
+def _constituents_frame(constituents: List[Dict]) -> pd.DataFrame:
+    """Constituent sector/industry/founded columns indexed by symbol."""
+    return (
+        pd.DataFrame(constituents)
+        .reindex(columns=["symbol", "sector", "subSector", "founded"])
+        .rename(columns={"subSector": "industry"})
+        .drop_duplicates("symbol")
+        .set_index("symbol")
+    )
+
+
+def _build_stock_frame(quotes: List[Dict], constituents_df: pd.DataFrame) -> pd.DataFrame:
+    """Map FMP quotes + constituent data into our stocks schema, column-wise."""
+    df = pd.DataFrame(quotes).reindex(
+        columns=["symbol", "name", "changesPercentage", *_QUOTE_NUMERIC_COLUMNS]
+    )
+    df[_QUOTE_NUMERIC_COLUMNS] = df[_QUOTE_NUMERIC_COLUMNS].apply(
+        pd.to_numeric, errors="coerce"
+    )
+    change_1d = (
+        df["changesPercentage"]
+        .astype(str)
+        .str.replace("%", "", regex=False)
+        .str.replace("+", "", regex=False)
+        .pipe(pd.to_numeric, errors="coerce")
+        .fillna(0.0)
+    )
+
+    df = df.assign(change_1d=change_1d)
+    df = df[df["symbol"].notna() & (df["symbol"] != "")]
+    df = df.join(constituents_df, on="symbol")
+
+    has_name = df["name"].notna() & (df["name"] != "")
+    stocks = pd.DataFrame(
+        {
+            # Identifiers
+            "ticker": df["symbol"].str.upper(),
+            "name": df["name"].where(has_name, df["symbol"]),
+            "sector": df["sector"].fillna(""),
+            "industry": df["industry"].fillna(""),
+            # Price & performance
+            "price": df["price"].fillna(0.0),
+            "change_1d": df["change_1d"],
+            "change_1w": 0.0,
+            "change_1m": 0.0,
+            "change_1y": 0.0,
+            "change_5y": 0.0,
+            "change_ytd": 0.0,
+            # Volume
+            "volume": df["volume"].fillna(0).astype("int64"),
+            # High/Low
+            "high_1d": df["dayHigh"].fillna(0.0),
+            "low_1d": df["dayLow"].fillna(0.0),
+            "high_1m": None,
+            "low_1m": None,
+            "high_1y": df["yearHigh"].fillna(0.0),
+            "low_1y": df["yearLow"].fillna(0.0),
+            "high_5y": None,
+            "low_5y": None,
+            # Valuation
+            "pe_ratio": df["pe"],
+            "eps": df["eps"],
+            "dividend_yield": 0.0,
+            "market_cap": df["marketCap"].fillna(0.0),
+            "shares_outstanding": df["sharesOutstanding"],
+            # Profitability / balance sheet placeholders
+            "net_profit_margin": 0.0,
+            "gross_margin": 0.0,
+            "roe": 0.0,
+            "revenue_ttm": None,
+            "beta": None,
+            "institutional_ownership": None,
+            "debt_to_equity": None,
+            # Company info
+            "year_founded": pd.to_numeric(df["founded"], errors="coerce").astype("Int64"),
+            "website": None,
+            "city": None,
+            "state": None,
+            "zip": None,
+            "weight": 0.0,
+            # Metadata
+            "last_updated": datetime.now().isoformat(),
+            "data_source": "fmp",
+            "is_sp500": 1,
+        },
+        index=df.index,
+    )
+    # NaN / <NA> -> None so SQLite stores NULL
+    stocks = stocks.reindex(columns=STOCK_COLUMNS).astype(object)
+    return stocks.where(stocks.notna(), None)
+
+
+def fetch_and_import_sp500_from_fmp(force_refresh: bool = False) -> int:
     """
     Fetch S&P 500 stocks from FMP and update database.
+    The constituent list is disk-cached for a day unless force_refresh.
     """
-    print("\n" + "=" * 60)
-    print("FETCHING S&P 500 FROM FMP")
-    print("=" * 60)
+    logger.info("Fetching S&P 500 from FMP")
 
     start_time = time.time()
     success_count = 0
 
     try:
-        print("Fetching S&P 500 constituent list...")
-        constituents = fmp_client.get_sp500_constituents()
+        logger.debug("Fetching S&P 500 constituent list")
+        constituents = disk_cached(
+            "sp500_fmp_constituents",
+            86400,
+            fmp_client.get_sp500_constituents,
+            force=force_refresh,
+        )
         if not constituents:
-            print("No constituents returned from FMP.")
+            logger.warning("No constituents returned from FMP")
             return 0
 
-        print(f"Found {len(constituents)} constituents")
-        symbol_list = [c["symbol"] for c in constituents]
-        constituents_map = {c["symbol"]: c for c in constituents}
+        logger.info("Found %d constituents", len(constituents))
+        constituents_df = _constituents_frame(constituents)
+        symbol_list = constituents_df.index.dropna().tolist()
 
-        all_quotes: List[Dict] = []
-        total_batches = (len(symbol_list) - 1) // BATCH_SIZE + 1
-
-        for idx in range(0, len(symbol_list), BATCH_SIZE):
-            batch = symbol_list[idx : idx + BATCH_SIZE]
-            print(
-                f"Fetching batch {idx // BATCH_SIZE + 1}/{total_batches} ({len(batch)} symbols)...",
-                end=" ",
-            )
-            try:
-                quotes = fmp_client.get_batch_quotes(batch)
-                all_quotes.extend(quotes)
-                print(f"ok ({len(quotes)} quotes)")
-            except Exception as exc:
-                print(f"failed: {exc}")
-            time.sleep(0.2)  # stay under rate limits
-
-        print(f"Total quotes fetched: {len(all_quotes)}")
-
-        stocks_to_insert = []
-        for quote in all_quotes:
-            symbol = quote.get("symbol")
-            if not symbol:
+        # Build and write each quote chunk as it arrives; the remaining
+        # chunks keep downloading while the previous one is inserted.
+        logger.debug("Fetching quotes for %d symbols", len(symbol_list))
+        quote_count = 0
+        for quotes in fmp_client.iter_batch_quotes(symbol_list):
+            if not quotes:
                 continue
-            payload = _build_stock_payload(quote, constituents_map.get(symbol))
-            stocks_to_insert.append(payload)
-
-        if stocks_to_insert:
-            success_count = db.insert_stocks_bulk(stocks_to_insert)
+            quote_count += len(quotes)
+            # The frame is already column-major; pass its columns straight
+            # through instead of walking it row by row with itertuples
+            frame = _build_stock_frame(quotes, constituents_df)
+            if not frame.empty:
+                success_count += db.insert_stocks_bulk_cols(
+                    {col: frame[col].tolist() for col in STOCK_COLUMNS}
+                )
+        logger.info("Total quotes fetched: %d", quote_count)
 
         duration = time.time() - start_time
-        print("=" * 60)
-        print("S&P 500 import complete")
-        print(f"   Stocks updated: {success_count}/{len(constituents)}")
-        print(f"   Duration: {duration:.2f}s")
-        print("=" * 60)
+        logger.info(
+            "S&P 500 import complete: %d/%d stocks updated in %.2fs",
+            success_count,
+            len(constituents),
+            duration,
+        )
 
         db.log_refresh(
             stocks_updated=success_count,
@@ -155,7 +213,7 @@ def fetch_and_import_sp500_from_fmp() -> int:
         return success_count
     except Exception as exc:
         duration = time.time() - start_time
-        print(f"Import failed: {exc}")
+        logger.error("Import failed: %s", exc)
         db.log_refresh(
             stocks_updated=0,
             data_source="fmp",
@@ -168,11 +226,11 @@ def fetch_and_import_sp500_from_fmp() -> int:
 
 def fetch_and_import_indices_from_fmp() -> int:
     """Fetch market indices from FMP and update database."""
-    print("\nFetching market indices from FMP...")
+    logger.info("Fetching market indices from FMP")
     try:
         quotes = fmp_client.get_index_quotes()
         if not quotes:
-            print("No index data received")
+            logger.warning("No index data received")
             return 0
 
         symbol_map = {
@@ -183,120 +241,99 @@ def fetch_and_import_indices_from_fmp() -> int:
             "^VIX": "VIX",
         }
 
-        count = 0
+        rows = []
         for quote in quotes:
             fmp_symbol = quote.get("symbol")
             if not fmp_symbol:
                 continue
             target_symbol = symbol_map.get(fmp_symbol, fmp_symbol)
-            db.insert_or_update_index(
-                symbol=target_symbol,
-                name=quote.get("name", target_symbol),
-                value=_to_float(quote.get("price")),
-                change=_to_float(quote.get("change")),
-                change_pct=_clean_change_percent(quote.get("changesPercentage")),
-            )
-            count += 1
-            print(
-                f"  {target_symbol}: {quote.get('price')} "
-                f"({_clean_change_percent(quote.get('changesPercentage')):+.2f}%)"
+            change_pct = _clean_change_percent(quote.get("changesPercentage"))
+            rows.append(
+                (
+                    target_symbol,
+                    quote.get("name", target_symbol),
+                    _to_float(quote.get("price")),
+                    _to_float(quote.get("change")),
+                    change_pct,
+                )
             )
-        return count
+            logger.debug("%s: %s (%+.2f%%)", target_symbol, quote.get("price"), change_pct)
+        return db.bulk_insert_indices(rows)
     except Exception as exc:
-        print(f"Failed to fetch indices: {exc}")
+        logger.error("Failed to fetch indices: %s", exc)
         return 0
 
 
 def fetch_and_import_sector_performance() -> int:
     """Fetch sector performance from FMP and store in database."""
-    print("\nFetching sector performance...")
+    logger.info("Fetching sector performance")
     try:
         sectors = fmp_client.get_sector_performance()
         if not sectors:
-            print("No sector data received")
+            logger.warning("No sector data received")
             return 0
 
-        count = 0
+        rows = []
         for sector in sectors:
             change_val = _clean_change_percent(sector.get("changesPercentage"))
-            db.insert_or_update_sector_performance(
-                sector=sector.get("sector", "Unknown"), change_percent=change_val
-            )
-            count += 1
-            print(f"  {sector.get('sector')}: {change_val:+.2f}%")
-        return count
+            rows.append((sector.get("sector", "Unknown"), change_val))
+            logger.debug("%s: %+.2f%%", sector.get("sector"), change_val)
+        return db.bulk_upsert_sector_performance(rows)
     except Exception as exc:
-        print(f"Failed to fetch sectors: {exc}")
+        logger.error("Failed to fetch sectors: %s", exc)
         return 0
 
 
+def _mover_row(stock: Dict, category: str) -> tuple:
+    """Map an FMP mover quote to a market_movers row tuple."""
+    return (
+        stock.get("symbol"),
+        stock.get("name"),
+        _to_float(stock.get("price")),
+        _to_float(stock.get("change")),
+        _clean_change_percent(stock.get("changesPercentage")),
+        int(_to_float(stock.get("volume"), 0)),
+        category,
+        _to_float(stock.get("marketCap"), None),
+    )
+
+
 def fetch_and_import_market_movers() -> int:
     """Fetch top gainers/losers/actives from FMP and cache in DB."""
-    print("\nFetching market movers...")
-    total = 0
+    logger.info("Fetching market movers")
     try:
-        db.clear_market_movers()
-
         gainers = fmp_client.get_gainers()[:10]
-        for stock in gainers:
-            db.insert_market_mover(
-                ticker=stock.get("symbol"),
-                name=stock.get("name"),
-                price=_to_float(stock.get("price")),
-                change=_to_float(stock.get("change")),
-                change_percent=_clean_change_percent(stock.get("changesPercentage")),
-                volume=int(_to_float(stock.get("volume"), 0)),
-                category="gainer",
-                market_cap=_to_float(stock.get("marketCap"), None),
-            )
-        total += len(gainers)
-        print(f"  Gainers: {len(gainers)}")
-
         losers = fmp_client.get_losers()[:10]
-        for stock in losers:
-            db.insert_market_mover(
-                ticker=stock.get("symbol"),
-                name=stock.get("name"),
-                price=_to_float(stock.get("price")),
-                change=_to_float(stock.get("change")),
-                change_percent=_clean_change_percent(stock.get("changesPercentage")),
-                volume=int(_to_float(stock.get("volume"), 0)),
-                category="loser",
-                market_cap=_to_float(stock.get("marketCap"), None),
-            )
-        total += len(losers)
-        print(f"  Losers: {len(losers)}")
-
         actives = fmp_client.get_actives()[:10]
-        for stock in actives:
-            db.insert_market_mover(
-                ticker=stock.get("symbol"),
-                name=stock.get("name"),
-                price=_to_float(stock.get("price")),
-                change=_to_float(stock.get("change")),
-                change_percent=_clean_change_percent(stock.get("changesPercentage")),
-                volume=int(_to_float(stock.get("volume"), 0)),
-                category="active",
-                market_cap=_to_float(stock.get("marketCap"), None),
-            )
-        total += len(actives)
-        print(f"  Actives: {len(actives)}")
+
+        rows = [
+            _mover_row(stock, category)
+            for category, stocks in (("gainer", gainers), ("loser", losers), ("active", actives))
+            for stock in stocks
+        ]
+        total = db.bulk_insert_market_movers(rows)
+        logger.info(
+            "Movers: %d gainers, %d losers, %d actives",
+            len(gainers),
+            len(losers),
+            len(actives),
+        )
 
         return total
     except Exception as exc:
-        print(f"Failed to fetch market movers: {exc}")
+        logger.error("Failed to fetch market movers: %s", exc)
         return 0
 
 
 def fetch_and_import_earnings_calendar() -> int:
     """Fetch earnings calendar for the recent window and store in DB."""
-    print("\nFetching earnings calendar...")
+    logger.info("Fetching earnings calendar")
     try:
         from_date = (datetime.now() - timedelta(days=90)).strftime("%Y-%m-%d")
         to_date = (datetime.now() + timedelta(days=14)).strftime("%Y-%m-%d")
         earnings = fmp_client.get_earnings_calendar(from_date=from_date, to_date=to_date)
         if not earnings:
-            print("No earnings data received")
+            logger.warning("No earnings data received")
             return 0
 
         count = 0
@@ -313,36 +350,35 @@ def fetch_and_import_earnings_calendar() -> int:
                 time=earning.get("time", ""),
             )
             count += 1
-        print(f"  Earnings entries: {count}")
+        logger.info("Earnings entries: %d", count)
         return count
     except Exception as exc:
-        print(f"Failed to fetch earnings: {exc}")
+        logger.error("Failed to fetch earnings: %s", exc)
         return 0
 
 
 def refresh_all_fmp_data() -> Dict[str, int]:
-    """Refresh all FMP-backed datasets."""
-    print("\n" + "=" * 60)
-    print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - FMP DATA REFRESH")
-    print("=" * 60)
-
-    stocks_count = fetch_and_import_sp500_from_fmp()
-    indices_count = fetch_and_import_indices_from_fmp()
-    sectors_count = fetch_and_import_sector_performance()
-    movers_count = fetch_and_import_market_movers()
-
-    print("=" * 60)
-    print("REFRESH COMPLETE")
-    print(f"   Stocks: {stocks_count}")
-    print(f"   Indices: {indices_count}")
-    print(f"   Sectors: {sectors_count}")
-    print(f"   Market Movers: {movers_count}")
-    print("=" * 60)
-
-    return {
-        "stocks": stocks_count,
-        "indices": indices_count,
-        "sectors": sectors_count,
-        "movers": movers_count,
+    """
+    Refresh all FMP-backed datasets.
+    The stages hit different endpoints and write different tables, so they
+    run concurrently (DatabaseManager connections are per thread).
+    """
+    logger.info("FMP data refresh started")
+
+    stages = {
+        "stocks": fetch_and_import_sp500_from_fmp,
+        "indices": fetch_and_import_indices_from_fmp,
+        "sectors": fetch_and_import_sector_performance,
+        "movers": fetch_and_import_market_movers,
     }
+    results = run_importers(stages)
+
+    logger.info(
+        "Refresh complete: %d stocks, %d indices, %d sectors, %d movers",
+        results["stocks"],
+        results["indices"],
+        results["sectors"],
+        results["movers"],
+    )
 
+    return {name: results[name] for name in stages}
@@ -5,23 +5,49 @@ Hybrid Data Importer
 - Sector + movers calculated locally
 """
 
+import hashlib
+import logging
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache, partial
 from typing import Dict, List
 
-import requests
+import pandas as pd
 import yfinance as yf
 
 from database.db_manager import db
 from services.fmp_client import fmp_client
+from utils.cache import disk_cached
+from utils.concurrency import run_importers
+from utils.http import stream_json_kvitems
 
+logger = logging.getLogger(__name__)
 
-BATCH_SIZE = 20
+SP500LIVE_URL = "https://www.sp500live.co/sp500_companies.json"
+# S&P membership changes a few times a year; refetch the list at most weekly
+CONSTITUENTS_CACHE_TTL = 7 * 86400
+# Survives restarts, unlike the client's 60s in-memory response cache
+SECTOR_SNAPSHOT_CACHE_TTL = 300
+# Stocks quoted more recently than this are not re-fetched (unless force_refresh)
+QUOTE_FRESH_TTL = timedelta(minutes=5)
 
 
-def fetch_sp500_list_from_sp500live() -> List[Dict]:
+def fetch_sp500_list_from_sp500live(force_refresh: bool = False) -> List[Dict]:
     """
-    Fetch S&P 500 constituent list from SP500Live.co (ticker keyed dict).
+    Fetch S&P 500 constituent list from SP500Live.co, served from the disk
+    cache while it is younger than CONSTITUENTS_CACHE_TTL.
+    """
+    return disk_cached(
+        "sp500live_" + hashlib.md5(SP500LIVE_URL.encode()).hexdigest(),
+        CONSTITUENTS_CACHE_TTL,
+        lambda: _download_sp500live(SP500LIVE_URL),
+        force=force_refresh,
+    )
+
+
+def _download_sp500live(url: str) -> List[Dict]:
+    """
+    Download and parse the SP500Live list (ticker keyed dict).
     JSON format:
     {
       "AAPL": {...},
@@ -29,23 +55,12 @@ def fetch_sp500_list_from_sp500live() -> List[Dict]:
       ...
     }
     """
-    url = "https://www.sp500live.co/sp500_companies.json"
-
     try:
-        print(f"  Fetching from {url}...")
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        raw_data = response.json()
-
-        print(f"  Raw response type: {type(raw_data)}")
-
-        if not isinstance(raw_data, dict):
-            raise ValueError(f"Unexpected response format: {type(raw_data)}")
-
-        print(f"  Processing {len(raw_data)} items...")
-
+        logger.debug("Fetching from %s", url)
+        # Entries are parsed as the body streams in; a non-object top level
+        # yields none and ends up as an empty (uncached) list
         constituents = []
-        for ticker, data in raw_data.items():
+        for ticker, data in stream_json_kvitems(url, timeout=30):
             if not ticker or not isinstance(data, dict):
                 continue
             constituents.append(
@@ -57,24 +72,74 @@ def fetch_sp500_list_from_sp500live() -> List[Dict]:
                 }
             )
 
-        print(f"  [OK] Parsed {len(constituents)} valid constituents")
+        logger.info("Parsed %d valid constituents", len(constituents))
         return constituents
 
     except Exception as e:
-        print(f"  [ERROR] Failed to fetch SP500Live list: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Failed to fetch SP500Live list: %s", e)
         return []
 
 
 def _to_float(val, default=0.0) -> float:
+    # JSON numbers are almost always float/int already; skip the try/except
+    val_type = type(val)
+    if val_type is float:
+        return val
+    if val_type is int:
+        return float(val)
+    if val is None:
+        return default
     try:
         return float(val)
     except (TypeError, ValueError):
         return default
 
 
+def _to_int(val, default: int = 0) -> int:
+    if type(val) is int:
+        return val
+    return int(_to_float(val, default))
+
+
+# Shared constant runs for the columns the hybrid import never fills
+_ZERO_CHANGES = (0.0,) * 5  # change_1w, change_1m, change_1y, change_5y, change_ytd
+# net_profit_margin .. zip: populated later from profile/key-metrics
+_PROFILE_PLACEHOLDERS = (None,) * 12
+
+
+def _hybrid_stock_row(ticker: str, constituent: Dict, quote: Dict, last_updated: str) -> tuple:
+    """One stocks row as a plain tuple in STOCK_COLUMNS order."""
+    return (
+        ticker,
+        constituent.get("name") or quote.get("name", ticker),
+        constituent.get("sector") or "",
+        constituent.get("industry") or "",
+        _to_float(quote.get("price")),
+        _to_float(quote.get("changesPercentage")),
+        *_ZERO_CHANGES,
+        _to_int(quote.get("volume")),
+        _to_float(quote.get("dayHigh")),
+        _to_float(quote.get("dayLow")),
+        None,  # high_1m
+        None,  # low_1m
+        _to_float(quote.get("yearHigh")),
+        _to_float(quote.get("yearLow")),
+        None,  # high_5y
+        None,  # low_5y
+        _to_float(quote.get("pe"), None),
+        _to_float(quote.get("eps"), None),
+        0.0,  # dividend_yield
+        _to_float(quote.get("marketCap")),
+        _to_float(quote.get("sharesOutstanding"), None),
+        *_PROFILE_PLACEHOLDERS,
+        0.0,  # weight
+        last_updated,
+        "hybrid_sp500live_fmp",
+        1,  # is_sp500
+    )
+
+
+@lru_cache(maxsize=1024)
 def _normalize_ticker_for_fmp(ticker: str) -> str:
     """
     Normalize tickers for FMP stable endpoints.
@@ -83,116 +148,74 @@ def _normalize_ticker_for_fmp(ticker: str) -> str:
     return ticker.replace(".", "-").strip()
 
 
-def fetch_and_import_sp500_hybrid() -> int:
+def fetch_and_import_sp500_hybrid(force_refresh: bool = False) -> int:
     """
     Hybrid S&P 500 import:
-    1) Constituents from SP500Live
-    2) Quotes from FMP
+    1) Constituents from SP500Live (disk-cached unless force_refresh)
+    2) Quotes from FMP for stocks not updated within QUOTE_FRESH_TTL
+       (all of them if force_refresh)
     3) Merge and store in DB
     """
-    print("\n" + "=" * 60)
-    print("HYBRID S&P 500 IMPORT (SP500Live + FMP)")
-    print("=" * 60)
+    logger.info("Hybrid S&P 500 import (SP500Live + FMP)")
 
     start_time = time.time()
     success_count = 0
 
     try:
-        print("Fetching S&P 500 list from SP500Live.co...")
-        constituents = fetch_sp500_list_from_sp500live()
+        logger.debug("Fetching S&P 500 list from SP500Live.co")
+        constituents = fetch_sp500_list_from_sp500live(force_refresh=force_refresh)
         if not constituents:
-            print("[ERROR] Failed to fetch S&P 500 list")
+            logger.error("Failed to fetch S&P 500 list")
             return 0
-        print(f"[OK] Found {len(constituents)} S&P 500 constituents")
-
-        symbols = [c["ticker"] for c in constituents if c.get("ticker")]
-        # Map original -> normalized for FMP
-        ticker_map = {sym: _normalize_ticker_for_fmp(sym) for sym in symbols}
-        fmp_symbols = list(ticker_map.values())
-        all_quotes: List[Dict] = []
-        total_batches = (len(fmp_symbols) - 1) // BATCH_SIZE + 1
-        print(f"Fetching quotes from FMP ({len(fmp_symbols)} stocks)...")
-        for i in range(0, len(fmp_symbols), BATCH_SIZE):
-            batch = fmp_symbols[i : i + BATCH_SIZE]
-            batch_num = i // BATCH_SIZE + 1
-            print(f"  Batch {batch_num}/{total_batches}...", end=" ")
-            try:
-                quotes = fmp_client.get_batch_quotes(batch)
-                all_quotes.extend(quotes)
-                print(f"[OK] {len(quotes)} quotes")
-            except Exception as exc:
-                print(f"[ERROR] Error: {exc}")
-            time.sleep(0.3)  # stay under rate limits
-
-        print(f"[OK] Total quotes fetched: {len(all_quotes)}")
-        quote_map = {q.get("symbol"): q for q in all_quotes if q.get("symbol")}
-
-        stocks_to_insert = []
-        for c in constituents:
-            ticker = c.get("ticker")
-            if not ticker:
-                continue
-            fmp_symbol = ticker_map.get(ticker, ticker)
-            quote = quote_map.get(fmp_symbol)
-            if not quote:
-                print(f"[WARN] No FMP quote for {ticker} (FMP symbol {fmp_symbol}), skipping...")
-                continue
+        logger.info("Found %d S&P 500 constituents", len(constituents))
+
+        # Constituents keyed by their FMP symbol (BRK.B -> BRK-B)
+        by_fmp = {
+            _normalize_ticker_for_fmp(c["ticker"]): c for c in constituents if c.get("ticker")
+        }
+        if not force_refresh:
+            # Rows written inside the TTL window keep their DB copy as-is
+            fresh = set(db.get_fresh_tickers((datetime.now() - QUOTE_FRESH_TTL).isoformat()))
+            if fresh:
+                by_fmp = {sym: c for sym, c in by_fmp.items() if c["ticker"] not in fresh}
+                logger.info(
+                    "%d symbols still fresh, %d to refresh", len(fresh), len(by_fmp)
+                )
 
-            stocks_to_insert.append(
-                {
-                    "ticker": ticker,
-                    "name": c.get("name") or quote.get("name", ticker),
-                    "sector": c.get("sector") or "",
-                    "industry": c.get("industry") or "",
-                    "price": _to_float(quote.get("price")),
-                    "change_1d": _to_float(quote.get("changesPercentage")),
-                    "change_1w": 0.0,
-                    "change_1m": 0.0,
-                    "change_1y": 0.0,
-                    "change_5y": 0.0,
-                    "change_ytd": 0.0,
-                    "volume": int(_to_float(quote.get("volume"), 0)),
-                    "high_1d": _to_float(quote.get("dayHigh")),
-                    "low_1d": _to_float(quote.get("dayLow")),
-                    "high_1m": None,
-                    "low_1m": None,
-                    "high_1y": _to_float(quote.get("yearHigh")),
-                    "low_1y": _to_float(quote.get("yearLow")),
-                    "high_5y": None,
-                    "low_5y": None,
-                    "pe_ratio": _to_float(quote.get("pe"), None),
-                    "eps": _to_float(quote.get("eps"), None),
-                    "dividend_yield": 0.0,
-                    "market_cap": _to_float(quote.get("marketCap")),
-                    "shares_outstanding": _to_float(quote.get("sharesOutstanding"), None),
-                    "net_profit_margin": None,  # Populated from profile/key-metrics
-                    "gross_margin": None,       # Populated from profile/key-metrics
-                    "roe": None,                # Populated from profile/key-metrics
-                    "revenue_ttm": None,
-                    "beta": None,               # Populated from profile
-                    "institutional_ownership": None,
-                    "debt_to_equity": None,
-                    "year_founded": None,
-                    "website": None,
-                    "city": None,
-                    "state": None,
-                    "zip": None,
-                    "weight": 0.0,
-                    "last_updated": datetime.now().isoformat(),
-                    "data_source": "hybrid_sp500live_fmp",
-                    "is_sp500": 1,
-                }
-            )
+        # get_batch_quotes fans multi-symbol chunks out over a bounded pool
+        logger.info("Fetching quotes from FMP (%d stocks)", len(by_fmp))
+        try:
+            all_quotes: List[Dict] = fmp_client.get_batch_quotes(list(by_fmp))
+        except Exception as exc:
+            logger.error("Quote fetch failed: %s", exc)
+            all_quotes = []
+
+        logger.info("Total quotes fetched: %d", len(all_quotes))
+        quote_map = {symbol: q for q in all_quotes if (symbol := q.get("symbol"))}
+
+        missing = by_fmp.keys() - quote_map.keys()
+        if missing:
+            logger.warning("No FMP quote for %d symbols, skipping them", len(missing))
+            logger.debug("Missing FMP quotes: %s", sorted(missing))
+
+        # One timestamp for the whole import instead of one per row
+        now_iso = datetime.now().isoformat()
+        stocks_to_insert = [
+            _hybrid_stock_row(c["ticker"], c, quote, now_iso)
+            for fmp_symbol, quote in quote_map.items()
+            if (c := by_fmp.get(fmp_symbol))
+        ]
 
         if stocks_to_insert:
             success_count = db.insert_stocks_bulk(stocks_to_insert)
 
         duration = time.time() - start_time
-        print("=" * 60)
-        print("[OK] HYBRID S&P 500 IMPORT COMPLETE")
-        print(f"   Stocks updated: {success_count}/{len(constituents)}")
-        print(f"   Duration: {duration:.2f}s")
-        print("=" * 60)
+        logger.info(
+            "Hybrid S&P 500 import complete: %d/%d stocks updated in %.2fs",
+            success_count,
+            len(constituents),
+            duration,
+        )
 
         db.log_refresh(
             stocks_updated=success_count,
@@ -203,7 +226,7 @@ def fetch_and_import_sp500_hybrid() -> int:
         return success_count
     except Exception as exc:
         duration = time.time() - start_time
-        print(f"[ERROR] Import failed: {exc}")
+        logger.error("Import failed: %s", exc)
         db.log_refresh(
             stocks_updated=0,
             data_source="hybrid_sp500live_fmp",
@@ -218,7 +241,7 @@ def fetch_and_import_indices_from_fmp() -> int:
     """
     Fetch market indices - use yfinance directly (FMP Starter not supported for indices).
     """
-    print("\nFetching market indices (using yfinance - FMP doesn't support indices)...")
+    logger.info("Fetching market indices (using yfinance - FMP doesn't support indices)")
     return fetch_and_import_indices_from_yfinance()
 
 
@@ -226,7 +249,7 @@ def fetch_and_import_indices_from_yfinance() -> int:
     """
     Fetch market indices from yfinance
     """
-    print("  Using yfinance for market indices...")
+    logger.debug("Using yfinance for market indices")
 
     indices = {
         "^GSPC": ("SPX", "S&P 500"),
@@ -236,75 +259,82 @@ def fetch_and_import_indices_from_yfinance() -> int:
         "^VIX": ("VIX", "CBOE Volatility Index"),
     }
 
-    success_count = 0
+    # One batched request for all tickers instead of a history() call each
+    try:
+        data = yf.download(
+            list(indices),
+            period="5d",
+            group_by="ticker",
+            threads=True,
+            progress=False,
+            auto_adjust=False,
+        )
+    except Exception as e:
+        logger.error("yfinance index download failed: %s", e)
+        return 0
 
+    rows = []
     for yf_symbol, (our_symbol, name) in indices.items():
         try:
-            print(f"  Fetching {our_symbol}...", end=" ")
-            ticker = yf.Ticker(yf_symbol)
-            hist = ticker.history(period="1mo")
-            if len(hist) >= 2:
-                current = float(hist["Close"].iloc[-1])
-                previous = float(hist["Close"].iloc[-2])
+            closes = data[yf_symbol]["Close"].dropna()
+            if len(closes) >= 2:
+                current = float(closes.iloc[-1])
+                previous = float(closes.iloc[-2])
                 change = current - previous
                 change_pct = (change / previous) * 100
-                db.insert_or_update_index(
-                    symbol=our_symbol,
-                    name=name,
-                    value=round(current, 2),
-                    change=round(change, 2),
-                    change_pct=round(change_pct, 2),
+                rows.append(
+                    (our_symbol, name, round(current, 2), round(change, 2), round(change_pct, 2))
                 )
-                print(f"[OK] {current:.2f} ({change_pct:+.2f}%)")
-                success_count += 1
+                logger.debug("%s: %.2f (%+.2f%%)", our_symbol, current, change_pct)
             else:
-                print(f"[ERROR] Insufficient data (got {len(hist)} rows)")
+                logger.warning("%s: insufficient data (got %d rows)", our_symbol, len(closes))
         except Exception as e:
-            print(f"[ERROR] Error: {e}")
+            logger.error("%s: %s", our_symbol, e)
 
+    success_count = db.bulk_insert_indices(rows)
     return success_count
 
 
 def calculate_sector_performance() -> int:
     """Calculate sector performance using cached stocks."""
-    print("\nCalculating sector performance from stocks...")
+    logger.info("Calculating sector performance from stocks")
     try:
         stocks = db.get_all_stocks()
         if not stocks:
-            print("[ERROR] No stocks in database")
+            logger.error("No stocks in database")
             return 0
 
-        sector_totals = {}
-        sector_counts = {}
-        for stock in stocks:
-            sector = stock.get("sector") or "Unknown"
-            change = stock.get("change_1d", 0) or 0
-            sector_totals[sector] = sector_totals.get(sector, 0.0) + change
-            sector_counts[sector] = sector_counts.get(sector, 0) + 1
-
-        for sector, total_change in sector_totals.items():
-            count = sector_counts.get(sector, 1)
-            avg_change = total_change / count if count else 0.0
-            db.insert_or_update_sector_performance(
-                sector=sector, change_percent=round(avg_change, 2)
-            )
-            print(f"[OK] {sector}: {avg_change:+.2f}% (avg of {count} stocks)")
+        df = pd.DataFrame(stocks, columns=["sector", "change_1d"])
+        df["sector"] = df["sector"].fillna("Unknown").replace("", "Unknown")
+        df["change_1d"] = pd.to_numeric(df["change_1d"], errors="coerce").fillna(0.0)
+        agg = df.groupby("sector", sort=False)["change_1d"].agg(["mean", "size"])
+
+        db.bulk_upsert_sector_performance(
+            [(sector, round(mean, 2)) for sector, mean in agg["mean"].items()]
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            for sector, mean, count in agg.itertuples():
+                logger.debug("%s: %+.2f%% (avg of %d stocks)", sector, mean, count)
 
-        return len(sector_totals)
+        return len(agg)
     except Exception as exc:
-        print(f"[ERROR] Failed to calculate sectors: {exc}")
+        logger.error("Failed to calculate sectors: %s", exc)
         return 0
 
 
 def fetch_and_import_sector_performance_from_fmp(date: str = None, exchange: str = None) -> int:
     """Fetch sector performance from FMP stable endpoint."""
-    print("\nFetching sector performance from FMP...")
+    logger.info("Fetching sector performance from FMP")
     try:
         if date is None:
             date = datetime.now().strftime("%Y-%m-%d")
-        rows = fmp_client.get_sector_performance_snapshot(date=date, exchange=exchange)
+        rows = disk_cached(
+            f"sector_snapshot_{date}_{exchange or 'all'}",
+            SECTOR_SNAPSHOT_CACHE_TTL,
+            lambda: fmp_client.get_sector_performance_snapshot(date=date, exchange=exchange),
+        )
         if not rows:
-            print("[ERROR] No sector data received from FMP")
+            logger.error("No sector data received from FMP")
             return 0
         count = 0
         for r in rows:
@@ -314,73 +344,71 @@ def fetch_and_import_sector_performance_from_fmp(date: str = None, exchange: str
                 continue
             db.insert_or_update_sector_performance(sector=sector, change_percent=float(avg))
             count += 1
-            print(f"[OK] {sector}: {avg:+.2f}%")
+            logger.debug("%s: %+.2f%%", sector, avg)
         return count
     except Exception as exc:
-        print(f"[ERROR] Failed to fetch sectors from FMP: {exc}")
+        logger.error("Failed to fetch sectors from FMP: %s", exc)
         return 0
 
 
 def fetch_and_import_market_movers_from_fmp(limit: int = 10) -> int:
     """Fetch market movers (gainers/losers) from FMP stable endpoints."""
-    print("\nFetching market movers from FMP...")
+    logger.info("Fetching market movers from FMP")
     try:
-        db.clear_market_movers()
         gainers = (fmp_client.get_biggest_gainers() or [])[:limit]
         losers = (fmp_client.get_biggest_losers() or [])[:limit]
 
-        for s in gainers:
-            db.insert_market_mover(
-                ticker=s.get("symbol"),
-                name=s.get("name"),
-                price=_to_float(s.get("price")),
-                change=_to_float(s.get("change")),
-                change_percent=_to_float(s.get("changesPercentage")),
-                volume=s.get("volume") or 0,
-                category="gainer",
-                market_cap=s.get("marketCap"),
-            )
-
-        for s in losers:
-            db.insert_market_mover(
-                ticker=s.get("symbol"),
-                name=s.get("name"),
-                price=_to_float(s.get("price")),
-                change=_to_float(s.get("change")),
-                change_percent=_to_float(s.get("changesPercentage")),
-                volume=s.get("volume") or 0,
-                category="loser",
-                market_cap=s.get("marketCap"),
+        rows = [
+            (
+                s.get("symbol"),
+                s.get("name"),
+                _to_float(s.get("price")),
+                _to_float(s.get("change")),
+                _to_float(s.get("changesPercentage")),
+                s.get("volume") or 0,
+                category,
+                s.get("marketCap"),
             )
+            for category, stocks in (("gainer", gainers), ("loser", losers))
+            for s in stocks
+        ]
+        # Clear + insert in one transaction so readers never see an empty table
+        db.bulk_insert_market_movers(rows)
 
-        print(f"[OK] Gainers: {len(gainers)}, Losers: {len(losers)}")
+        logger.info("Movers: %d gainers, %d losers", len(gainers), len(losers))
         return len(gainers) + len(losers)
     except Exception as exc:
-        print(f"[ERROR] Failed to fetch market movers: {exc}")
+        logger.error("Failed to fetch market movers: %s", exc)
         return 0
 
 
 def refresh_all_hybrid_data() -> Dict[str, int]:
     """Refresh all hybrid-backed datasets."""
-    print("\n" + "=" * 60)
-    print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - HYBRID DATA REFRESH")
-    print("=" * 60)
-
-    stocks_count = fetch_and_import_sp500_hybrid()
-    indices_count = fetch_and_import_indices_from_fmp()
+    logger.info("Hybrid data refresh started")
+
+    # Independent endpoints and tables: run the stages side by side
+    results = run_importers({
+        "stocks": fetch_and_import_sp500_hybrid,
+        "indices": fetch_and_import_indices_from_fmp,
+        "sectors": fetch_and_import_sector_performance_from_fmp,
+        "movers": partial(fetch_and_import_market_movers_from_fmp, 10),
+    })
+
+    stocks_count = results["stocks"]
+    indices_count = results["indices"]
     if indices_count == 0:
-        print("  FMP indices failed, using yfinance fallback...")
+        logger.warning("FMP indices failed, using yfinance fallback")
         indices_count = fetch_and_import_indices_from_yfinance()
-    sectors_count = fetch_and_import_sector_performance_from_fmp()
-    movers_count = fetch_and_import_market_movers_from_fmp(limit=10)
-
-    print("=" * 60)
-    print("[OK] REFRESH COMPLETE")
-    print(f"   Stocks: {stocks_count}")
-    print(f"   Indices: {indices_count}")
-    print(f"   Sectors: {sectors_count}")
-    print(f"   Market Movers: {movers_count}")
-    print("=" * 60)
+    sectors_count = results["sectors"]
+    movers_count = results["movers"]
+
+    logger.info(
+        "Refresh complete: %d stocks, %d indices, %d sectors, %d movers",
+        stocks_count,
+        indices_count,
+        sectors_count,
+        movers_count,
+    )
 
     return {
         "stocks": stocks_count,
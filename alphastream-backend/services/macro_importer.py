@@ -1,16 +1,38 @@
 """Fetch and import macro economic data into database"""
+import logging
+import threading
+import xml.etree.ElementTree as ET
 import yfinance as yf
 from fredapi import Fred
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from database.db_manager import db
 from config import FRED_API_KEY
-import requests
+from utils.concurrency import run_importers
+from utils.http import http_session
+
+logger = logging.getLogger(__name__)
+
+class _SessionFred(Fred):
+  """
+  Fred that fetches over the shared keep-alive http_session. fredapi opens
+  a fresh urlopen() connection per series; every FRED call here (macro
+  indicators, history, alt-asset fallbacks) now reuses pooled TLS sockets.
+  """
+
+  def _Fred__fetch_data(self, url):
+    # Overrides fredapi's private (name-mangled) __fetch_data
+    response = http_session.get(url + '&api_key=' + self.api_key, timeout=30)
+    root = ET.fromstring(response.content)
+    if not response.ok:
+      raise ValueError(root.get('message'))
+    return root
 
 
 # Initialize FRED client
 try:
-    fred = Fred(api_key=FRED_API_KEY) if FRED_API_KEY else None
+    fred = _SessionFred(api_key=FRED_API_KEY) if FRED_API_KEY else None
     if fred:
         print("FRED API client initialized")
     else:
@@ -86,63 +108,64 @@ def fetch_and_import_macro_indicators():
     'GDP_GROWTH': ('A191RL1Q225SBEA', 'GDP Growth (QoQ Annual)', '%'),
   }
 
-  count = 0
-  for indicator_id, (series_id, name, unit) in indicators.items():
-    try:
-      data = fred.get_series(series_id, observation_start='2023-01-01')
-
-      if len(data) == 0:
-        print(f"No data for {indicator_id}")
-        continue
-
-      current_value = float(data.iloc[-1])
-
-      # Calculate YoY for CPI and Core PCE
-      if 'YOY' in indicator_id and len(data) >= 13:
-        year_ago_value = float(data.iloc[-13])
-        current_value = ((current_value - year_ago_value) / year_ago_value) * 100
+  # The 7 FRED series and the DXY history are independent requests:
+  # fetch them concurrently, then do the math as each one lands.
+  with ThreadPoolExecutor(max_workers=8) as executor:
+    futures = {
+      executor.submit(fred.get_series, series_id, observation_start='2023-01-01'):
+        (indicator_id, name, unit)
+      for indicator_id, (series_id, name, unit) in indicators.items()
+    }
+    dxy_future = executor.submit(yf.Ticker('DX-Y.NYB').history, period='5d')
 
-      # Calculate change
-      change = 0
-      if len(data) >= 2:
-        previous_value = float(data.iloc[-2])
-        if 'YOY' in indicator_id and len(data) >= 14:
-          year_ago_prev = float(data.iloc[-14])
-          previous_value = ((previous_value - year_ago_prev) / year_ago_prev) * 100
-        change = current_value - previous_value
+    count = 0
+    for future in as_completed(futures):
+      indicator_id, name, unit = futures[future]
+      try:
+        data = future.result()
+
+        # CPI and Core PCE: turn the index level into a YoY % series
+        if 'YOY' in indicator_id and len(data) >= 13:
+          data = data.pct_change(12, fill_method=None).mul(100).dropna()
+
+        if len(data) == 0:
+          print(f"No data for {indicator_id}")
+          continue
+
+        current_value = float(data.iloc[-1])
+        change = float(data.iloc[-1] - data.iloc[-2]) if len(data) >= 2 else 0
+
+        db.insert_or_update_indicator(
+          indicator_id=indicator_id,
+          name=name,
+          value=round(current_value, 2),
+          change=round(change, 2) if change else None,
+          unit=unit
+        )
+        count += 1
 
-      db.insert_or_update_indicator(
-        indicator_id=indicator_id,
-        name=name,
-        value=round(current_value, 2),
-        change=round(change, 2) if change else None,
-        unit=unit
-      )
-      count += 1
+      except Exception as e:
+        print(f"Error fetching {indicator_id}: {e}")
+        continue
 
+    # DXY from yfinance
+    try:
+      dxy_hist = dxy_future.result()
+      if len(dxy_hist) >= 2:
+        current_dxy = float(dxy_hist['Close'].iloc[-1])
+        previous_dxy = float(dxy_hist['Close'].iloc[-2])
+        change_dxy = current_dxy - previous_dxy
+
+        db.insert_or_update_indicator(
+          indicator_id='DXY',
+          name='Dollar Index (DXY)',
+          value=round(current_dxy, 2),
+          change=round(change_dxy, 2),
+          unit='index'
+        )
+        count += 1
     except Exception as e:
-      print(f"Error fetching {indicator_id}: {e}")
-      continue
-
-  # DXY from yfinance
-  try:
-    dxy = yf.Ticker('DX-Y.NYB')
-    dxy_hist = dxy.history(period='5d')
-    if len(dxy_hist) >= 2:
-      current_dxy = float(dxy_hist['Close'].iloc[-1])
-      previous_dxy = float(dxy_hist['Close'].iloc[-2])
-      change_dxy = current_dxy - previous_dxy
-
-      db.insert_or_update_indicator(
-        indicator_id='DXY',
-        name='Dollar Index (DXY)',
-        value=round(current_dxy, 2),
-        change=round(change_dxy, 2),
-        unit='index'
-      )
-      count += 1
-  except Exception as e:
-    print(f"Error fetching DXY: {e}")
+      print(f"Error fetching DXY: {e}")
 
   print(f"Imported {count}/8 macro indicators")
   return count
@@ -165,18 +188,12 @@ def fetch_and_import_treasury_history():
     data_10y = fred.get_series('DGS10', observation_start=start_date)
     data_2y = fred.get_series('DGS2', observation_start=start_date)
 
-    count = 0
-    for date in data_10y.index:
-      yield_10y = float(data_10y.loc[date]) if not pd.isna(data_10y.loc[date]) else None
-      yield_2y = float(data_2y.loc[date]) if date in data_2y.index and not pd.isna(data_2y.loc[date]) else None
-
-      if yield_10y is not None:
-        db.insert_treasury_history(
-          date=date.strftime('%Y-%m-%d'),
-          yield_10y=round(yield_10y, 2),
-          yield_2y=round(yield_2y, 2) if yield_2y else None
-        )
-        count += 1
+    # One index-aligned join; keep valid 10Y dates, NaN 2Y values become NULL
+    df = pd.concat([data_10y.rename('y10'), data_2y.rename('y2')], axis=1)
+    df = df.dropna(subset=['y10']).astype(float).round(2)
+    y2 = df['y2'].astype(object).where(df['y2'].notna(), None)
+    rows = list(zip(df.index.strftime('%Y-%m-%d'), df['y10'].tolist(), y2.tolist()))
+    count = db.insert_treasury_history_bulk(rows)
 
     print(f"Imported {count} days of treasury history")
     return count
@@ -211,51 +228,26 @@ def fetch_and_import_cpi_history():
         # Get only the last 24 months of clean data (to calculate 12 months with YoY)
         data_cpi_recent = data_cpi_clean.iloc[-24:]
         
-        count = 0
-        errors = 0
-        
+        # Non-positive readings are invalid; masking them to NaN also makes
+        # any change computed against them NaN (stored as NULL)
+        cpi = data_cpi_recent.where(data_cpi_recent > 0)
+        mom = cpi.pct_change(fill_method=None).mul(100).round(2)
+        yoy = cpi.pct_change(12, fill_method=None).mul(100).round(2)
+
         # Start from index 12 to ensure we can calculate YoY
-        for i in range(12, len(data_cpi_recent)):
-            try:
-                date = data_cpi_recent.index[i]
-                cpi_value = float(data_cpi_recent.iloc[i])
-                
-                # Double-check value is valid
-                if pd.isna(cpi_value) or cpi_value <= 0:
-                    print(f"  Skipping invalid CPI value at {date}: {cpi_value}")
-                    errors += 1
-                    continue
-                
-                # Month-over-month change
-                prev_value = float(data_cpi_recent.iloc[i-1])
-                if pd.isna(prev_value) or prev_value <= 0:
-                    mom_change = None
-                else:
-                    mom_change = ((cpi_value - prev_value) / prev_value) * 100
-                
-                # Year-over-year change
-                year_ago_value = float(data_cpi_recent.iloc[i-12])
-                if pd.isna(year_ago_value) or year_ago_value <= 0:
-                    yoy_change = None
-                else:
-                    yoy_change = ((cpi_value - year_ago_value) / year_ago_value) * 100
-                
-                # Insert into database
-                db.insert_cpi_history(
-                    date=date.strftime('%Y-%m-%d'),
-                    cpi_value=round(cpi_value, 2),
-                    mom_change=round(mom_change, 2) if mom_change is not None else None,
-                    yoy_change=round(yoy_change, 2) if yoy_change is not None else None
-                )
-                count += 1
-                
-            except Exception as e:
-                print(f"  Error processing CPI data point {i}: {e}")
-                errors += 1
-                continue
+        window = pd.DataFrame({'cpi': cpi.round(2), 'mom': mom, 'yoy': yoy}).iloc[12:]
+        errors = int(window['cpi'].isna().sum())
+        window = window[window['cpi'].notna()]
+        window = window.astype(object).where(window.notna(), None)
+        rows = [
+            (date.strftime('%Y-%m-%d'), cpi_value, mom_change, yoy_change)
+            for date, cpi_value, mom_change, yoy_change in window.itertuples()
+        ]
         
         if errors > 0:
             print(f"  Warning: {errors} CPI data points skipped due to errors")
+
+        count = db.insert_cpi_history_bulk(rows)
         
         print(f"Imported {count} months of CPI history")
         return count
@@ -275,19 +267,19 @@ def fetch_and_import_vix_history():
   print("Fetching 12 months of VIX history...")
   try:
     vix = yf.Ticker('^VIX')
-    start_date = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
-    end_date = datetime.now().strftime('%Y-%m-%d')
+    today = datetime.now()
+    start_date = (today - timedelta(days=365)).strftime('%Y-%m-%d')
+    end_date = today.strftime('%Y-%m-%d')
     hist = vix.history(start=start_date, end=end_date)
 
-    count = 0
-    for date, row in hist.iterrows():
-      db.insert_vix_history(
-        date=date.strftime('%Y-%m-%d'),
-        vix_close=round(float(row['Close']), 2),
-        vix_high=round(float(row['High']), 2),
-        vix_low=round(float(row['Low']), 2)
+    ohlc = hist[['Close', 'High', 'Low']].astype(float).round(2)
+    rows = [
+      (date.strftime('%Y-%m-%d'), close, high, low)
+      for date, close, high, low in zip(
+        ohlc.index, ohlc['Close'].tolist(), ohlc['High'].tolist(), ohlc['Low'].tolist()
       )
-      count += 1
+    ]
+    count = db.insert_vix_history_bulk(rows)
 
     print(f"Imported {count} days of VIX history")
     return count
@@ -302,14 +294,15 @@ def fetch_and_import_vix_history():
 
 def refresh_all_macro_data():
   """Refresh current values only (not historical data)."""
-  # Indices are now refreshed via FMP; skip here to avoid overriding.
-  indices_count = 0
-  indicators_count = fetch_and_import_macro_indicators()
-  assets_count = fetch_and_import_alternative_assets()
+  counts = run_importers({
+    'indicators': fetch_and_import_macro_indicators,
+    'assets': fetch_and_import_alternative_assets,
+  })
   return {
-    'indices': indices_count,
-    'indicators': indicators_count,
-    'assets': assets_count,
+    # Indices are now refreshed via FMP; skip here to avoid overriding.
+    'indices': 0,
+    'indicators': counts['indicators'],
+    'assets': counts['assets'],
   }
 
 
@@ -321,11 +314,18 @@ def initialize_all_macro_data():
 
   # Indices handled by FMP importers
   indices_count = 0
-  indicators_count = fetch_and_import_macro_indicators()
-  treasury_count = fetch_and_import_treasury_history()
-  cpi_count = fetch_and_import_cpi_history()
-  vix_count = fetch_and_import_vix_history()
-  assets_count = fetch_and_import_alternative_assets()
+  counts = run_importers({
+    'indicators': fetch_and_import_macro_indicators,
+    'treasury': fetch_and_import_treasury_history,
+    'cpi': fetch_and_import_cpi_history,
+    'vix': fetch_and_import_vix_history,
+    'assets': fetch_and_import_alternative_assets,
+  })
+  indicators_count = counts['indicators']
+  treasury_count = counts['treasury']
+  cpi_count = counts['cpi']
+  vix_count = counts['vix']
+  assets_count = counts['assets']
 
   print("\n" + "=" * 60)
   print("MACRO DATA INITIALIZATION COMPLETE")
@@ -346,301 +346,241 @@ def initialize_all_macro_data():
 
 COINGECKO_API = "https://api.coingecko.com/api/v3"
 
-def fetch_crypto_from_coingecko(coin_id: str) -> dict:
+def fetch_cryptos_from_coingecko(coin_ids: list) -> dict:
   """
-  Fetch crypto price from CoinGecko (fallback for yfinance).
-  Returns: {'value': float, 'change_24h': float|None, 'change_percent_24h': float}
+  Fetch several crypto prices from CoinGecko in one /simple/price call
+  (fallback for yfinance).
+  Returns: {coin_id: {'value': float, 'change_24h': None, 'change_percent_24h': float}}
+  for every coin CoinGecko returned.
   """
   try:
     url = f"{COINGECKO_API}/simple/price"
     params = {
-      'ids': coin_id,
+      'ids': ','.join(coin_ids),
       'vs_currencies': 'usd',
       'include_24hr_change': 'true'
     }
-    response = requests.get(url, params=params, timeout=10)
+    response = http_session.get(url, params=params, timeout=10)
     response.raise_for_status()
     data = response.json()
-    if coin_id not in data:
-      raise ValueError(f"CoinGecko returned no data for {coin_id}")
-    coin_data = data[coin_id]
     return {
-      'value': coin_data['usd'],
-      'change_24h': None,
-      'change_percent_24h': coin_data.get('usd_24h_change', 0)
+      coin_id: {
+        'value': coin_data['usd'],
+        'change_24h': None,
+        'change_percent_24h': coin_data.get('usd_24h_change', 0)
+      }
+      for coin_id, coin_data in data.items()
+      if coin_id in coin_ids and 'usd' in coin_data
     }
   except Exception as e:
     raise Exception(f"CoinGecko fetch failed: {e}")
 
 
-def fetch_and_import_alternative_assets():
+def fetch_crypto_from_coingecko(coin_id: str) -> dict:
   """
-  Fetch crypto, commodities, and currencies with intelligent fallbacks.
-  Primary: yfinance -> Secondary: CoinGecko/FRED -> NULL if all fail.
+  Fetch one crypto price from CoinGecko (fallback for yfinance).
+  Returns: {'value': float, 'change_24h': float|None, 'change_percent_24h': float}
+  """
+  prices = fetch_cryptos_from_coingecko([coin_id])
+  if coin_id not in prices:
+    raise Exception(f"CoinGecko fetch failed: no data for {coin_id}")
+  return prices[coin_id]
+
+
+# (symbol, yfinance ticker, asset type, decimals, fallback source, fallback id,
+#  (yfinance name, fallback name, name stored on failure))
+ALTERNATIVE_ASSETS = (
+  ('BTC', 'BTC-USD', 'crypto', 2, 'CoinGecko', 'bitcoin',
+   ('Bitcoin', 'Bitcoin', 'Bitcoin')),
+  ('ETH', 'ETH-USD', 'crypto', 2, 'CoinGecko', 'ethereum',
+   ('Ethereum', 'Ethereum', 'Ethereum')),
+  ('GOLD', 'GC=F', 'commodity', 2, 'FRED', 'GOLDPMGBD228NLBM',
+   ('Gold Futures', 'Gold Spot', 'Gold')),
+  ('OIL', 'CL=F', 'commodity', 2, 'FRED', 'DCOILWTICO',
+   ('WTI Crude Oil', 'WTI Crude Oil Spot', 'WTI Crude Oil')),
+  ('NOKUSD', 'NOKUSD=X', 'currency', 4, 'FRED', 'DEXNOUS',
+   ('Norwegian Krone', 'Norwegian Krone', 'Norwegian Krone')),
+)
+
+
+def _last_change(series):
+  """(current, change, change %) from the last two points of a price series."""
+  current = float(series.iloc[-1])
+  previous = float(series.iloc[-2])
+  change = current - previous
+  change_pct = (change / previous) * 100 if previous else None
+  return current, change, change_pct
+
+
+def _store_asset(symbol, name, asset_type, decimals, current, change, change_pct):
+  db.insert_or_update_alternative_asset(
+    symbol=symbol, name=name, asset_type=asset_type,
+    value=round(current, decimals),
+    change=round(change, decimals) if change is not None and change_pct is not None else None,
+    change_percent=round(change_pct, 2) if change_pct is not None else None,
+    fetch_error=None
+  )
+
+
+def _download_closes(tickers):
+  """
+  Last 5 days of closes per ticker from one batched yfinance download.
+  Tickers with no data are left out; a failed download returns {}.
   """
-  print("\n" + "=" * 60)
-  print("FETCHING ALTERNATIVE ASSETS (with fallbacks)")
-  print("=" * 60)
-
-  success_count = 0
-  fail_count = 0
-
-  # --------------------------------------------------------------------------
-  # Helpers
-  # --------------------------------------------------------------------------
-  def store_failure(sym, name, asset_type, msg):
-    nonlocal fail_count
-    print(f"[ERROR] All sources failed: {msg}")
-    db.insert_or_update_alternative_asset(
-      symbol=sym,
-      name=name,
-      asset_type=asset_type,
-      value=None,
-      change=None,
-      change_percent=None,
-      fetch_error=msg,
-    )
-    fail_count += 1
-
-  # --------------------------------------------------------------------------
-  # BTC
-  # --------------------------------------------------------------------------
-  symbol = 'BTC'
   try:
-    print(f"Fetching {symbol}... ", end="")
-    success = False
-
-    # Primary: yfinance
-    try:
-      ticker = yf.Ticker('BTC-USD')
-      hist = ticker.history(period='5d')
-      if len(hist) >= 2:
-        current = float(hist['Close'].iloc[-1])
-        previous = float(hist['Close'].iloc[-2])
-        change = current - previous
-        change_pct = (change / previous) * 100
-        db.insert_or_update_alternative_asset(
-          symbol=symbol, name='Bitcoin', asset_type='crypto',
-          value=round(current, 2), change=round(change, 2),
-          change_percent=round(change_pct, 2), fetch_error=None
-        )
-        print(f"[OK] yfinance: {current:,.2f} ({change_pct:+.2f}%)")
-        success_count += 1
-        success = True
-    except Exception as e:
-      print(f"[WARN] yfinance failed ({e}), trying CoinGecko... ", end="")
-
-    if not success:
-      # Fallback: CoinGecko
-      cg_data = fetch_crypto_from_coingecko('bitcoin')
-      db.insert_or_update_alternative_asset(
-        symbol=symbol, name='Bitcoin', asset_type='crypto',
-        value=round(cg_data['value'], 2),
-        change=None,
-        change_percent=round(cg_data['change_percent_24h'], 2),
-        fetch_error=None
-      )
-      print(f"[OK] CoinGecko: {cg_data['value']:,.2f} ({cg_data['change_percent_24h']:+.2f}%)")
-      success_count += 1
-
+    data = yf.download(
+      list(tickers), period='5d', group_by='ticker', threads=True, progress=False
+    )
   except Exception as e:
-    store_failure(symbol, 'Bitcoin', 'crypto', f"yfinance + CoinGecko failed: {e}")
-
-  # --------------------------------------------------------------------------
-  # ETH
-  # --------------------------------------------------------------------------
-  symbol = 'ETH'
-  try:
-    print(f"Fetching {symbol}... ", end="")
-    success = False
+    print(f"[WARN] yfinance download failed ({e})")
+    return {}
 
+  closes = {}
+  for ticker in tickers:
     try:
-      ticker = yf.Ticker('ETH-USD')
-      hist = ticker.history(period='5d')
-      if len(hist) >= 2:
-        current = float(hist['Close'].iloc[-1])
-        previous = float(hist['Close'].iloc[-2])
-        change = current - previous
-        change_pct = (change / previous) * 100
-        db.insert_or_update_alternative_asset(
-          symbol=symbol, name='Ethereum', asset_type='crypto',
-          value=round(current, 2), change=round(change, 2),
-          change_percent=round(change_pct, 2), fetch_error=None
-        )
-        print(f"[OK] yfinance: {current:,.2f} ({change_pct:+.2f}%)")
-        success_count += 1
-        success = True
-    except Exception as e:
-      print(f"[WARN] yfinance failed ({e}), trying CoinGecko... ", end="")
-
-    if not success:
-      cg_data = fetch_crypto_from_coingecko('ethereum')
-      db.insert_or_update_alternative_asset(
-        symbol=symbol, name='Ethereum', asset_type='crypto',
-        value=round(cg_data['value'], 2),
-        change=None,
-        change_percent=round(cg_data['change_percent_24h'], 2),
-        fetch_error=None
-      )
-      print(f"[OK] CoinGecko: {cg_data['value']:,.2f} ({cg_data['change_percent_24h']:+.2f}%)")
-      success_count += 1
+      # Crypto trades daily and futures/FX don't: drop the other markets' days
+      closes[ticker] = data[ticker]['Close'].dropna()
+    except KeyError:
+      continue
+  return closes
 
-  except Exception as e:
-    store_failure(symbol, 'Ethereum', 'crypto', f"yfinance + CoinGecko failed: {e}")
 
-  # --------------------------------------------------------------------------
-  # GOLD
-  # --------------------------------------------------------------------------
-  symbol = 'GOLD'
-  try:
-    print(f"Fetching {symbol}... ", end="")
-    success = False
+def _fetch_alternative_asset(spec, closes, fred_data, coingecko_prices):
+  """
+  Store one ALTERNATIVE_ASSETS entry from its yfinance closes, else from its
+  CoinGecko/FRED fallback. fred_data(series_id) returns a (prefetched)
+  FRED series and coingecko_prices() the shared batch of CoinGecko quotes.
+  Returns None on success, or a failure record (symbol, name, asset_type,
+  message) for the caller to store.
+  Each source attempt is noted in msgs and logged as one record per asset,
+  so concurrent workers don't interleave their lines.
+  """
+  symbol, yf_ticker, asset_type, decimals, source, source_id, names = spec
+  yf_name, fallback_name, failure_name = names
+  value_fmt = ",.2f" if decimals == 2 else f".{decimals}f"
+  msgs = []
 
+  if closes is not None and len(closes) >= 2:
     try:
-      ticker = yf.Ticker('GC=F')
-      hist = ticker.history(period='5d')
-      if len(hist) >= 2:
-        current = float(hist['Close'].iloc[-1])
-        previous = float(hist['Close'].iloc[-2])
-        change = current - previous
-        change_pct = (change / previous) * 100
-        db.insert_or_update_alternative_asset(
-          symbol=symbol, name='Gold Futures', asset_type='commodity',
-          value=round(current, 2), change=round(change, 2),
-          change_percent=round(change_pct, 2), fetch_error=None
-        )
-        print(f"[OK] yfinance: {current:,.2f} ({change_pct:+.2f}%)")
-        success_count += 1
-        success = True
+      current, change, change_pct = _last_change(closes)
+      _store_asset(symbol, yf_name, asset_type, decimals, current, change, change_pct)
+      msgs.append(f"[OK] yfinance: {current:{value_fmt}} ({change_pct or 0:+.2f}%)")
+      logger.info("%s: %s", symbol, " | ".join(msgs))
+      return None
     except Exception as e:
-      print(f"[WARN] yfinance failed ({e}), trying FRED... ", end="")
-
-    if not success:
-      if not fred:
-        raise Exception("FRED API not configured")
-      start_date = (datetime.now() - timedelta(days=10)).strftime('%Y-%m-%d')
-      gold_data = fred.get_series('GOLDPMGBD228NLBM', observation_start=start_date)
-      if len(gold_data) < 2:
-        raise Exception(f"Insufficient FRED data: {len(gold_data)} points")
-      current = float(gold_data.iloc[-1])
-      previous = float(gold_data.iloc[-2])
-      change = current - previous
-      change_pct = (change / previous) * 100
-      db.insert_or_update_alternative_asset(
-        symbol=symbol, name='Gold Spot', asset_type='commodity',
-        value=round(current, 2), change=round(change, 2),
-        change_percent=round(change_pct, 2), fetch_error=None
-      )
-      print(f"[OK] FRED: {current:,.2f} ({change_pct:+.2f}%)")
-      success_count += 1
-
-  except Exception as e:
-    store_failure(symbol, 'Gold', 'commodity', f"yfinance + FRED failed: {e}")
+      msgs.append(f"[WARN] yfinance failed ({e})")
+  else:
+    msgs.append(f"[WARN] no yfinance data for {yf_ticker}")
 
-  # --------------------------------------------------------------------------
-  # OIL
-  # --------------------------------------------------------------------------
-  symbol = 'OIL'
   try:
-    print(f"Fetching {symbol}... ", end="")
-    success = False
-
-    try:
-      ticker = yf.Ticker('CL=F')
-      hist = ticker.history(period='5d')
-      if len(hist) >= 2:
-        current = float(hist['Close'].iloc[-1])
-        previous = float(hist['Close'].iloc[-2])
-        change = current - previous
-        change_pct = (change / previous) * 100
-        db.insert_or_update_alternative_asset(
-          symbol=symbol, name='WTI Crude Oil', asset_type='commodity',
-          value=round(current, 2), change=round(change, 2),
-          change_percent=round(change_pct, 2), fetch_error=None
-        )
-        print(f"[OK] yfinance: {current:,.2f} ({change_pct:+.2f}%)")
-        success_count += 1
-        success = True
-    except Exception as e:
-      print(f"[WARN] yfinance failed ({e}), trying FRED... ", end="")
-
-    if not success:
+    if source == 'CoinGecko':
+      cg_data = coingecko_prices().get(source_id)
+      if cg_data is None:
+        raise ValueError(f"CoinGecko returned no data for {source_id}")
+      current, change, change_pct = cg_data['value'], None, cg_data['change_percent_24h']
+    else:
       if not fred:
         raise Exception("FRED API not configured")
-      start_date = (datetime.now() - timedelta(days=10)).strftime('%Y-%m-%d')
-      oil_data = fred.get_series('DCOILWTICO', observation_start=start_date)
-      if len(oil_data) < 2:
-        raise Exception(f"Insufficient FRED data: {len(oil_data)} points")
-      current = float(oil_data.iloc[-1])
-      previous = float(oil_data.iloc[-2])
-      change = current - previous
-      change_pct = (change / previous) * 100
-      db.insert_or_update_alternative_asset(
-        symbol=symbol, name='WTI Crude Oil Spot', asset_type='commodity',
-        value=round(current, 2), change=round(change, 2),
-        change_percent=round(change_pct, 2), fetch_error=None
-      )
-      print(f"[OK] FRED: {current:,.2f} ({change_pct:+.2f}%)")
-      success_count += 1
-
+      data = fred_data(source_id)
+      if len(data) < 2:
+        raise Exception(f"Insufficient FRED data: {len(data)} points")
+      current, change, change_pct = _last_change(data)
+    _store_asset(symbol, fallback_name, asset_type, decimals, current, change, change_pct)
+    msgs.append(f"[OK] {source}: {current:{value_fmt}} ({change_pct or 0:+.2f}%)")
+    logger.info("%s: %s", symbol, " | ".join(msgs))
+    return None
   except Exception as e:
-    store_failure(symbol, 'WTI Crude Oil', 'commodity', f"yfinance + FRED failed: {e}")
+    msgs.append(f"[ERROR] {source} failed ({e})")
+    logger.warning("%s: %s", symbol, " | ".join(msgs))
+    return (symbol, failure_name, asset_type, f"yfinance + {source} failed: {e}")
 
-  # --------------------------------------------------------------------------
-  # NOK/USD
-  # --------------------------------------------------------------------------
-  symbol = 'NOKUSD'
-  try:
-    print(f"Fetching {symbol}... ", end="")
-    success = False
 
-    try:
-      ticker = yf.Ticker('NOKUSD=X')
-      hist = ticker.history(period='5d')
-      if len(hist) >= 2:
-        current = float(hist['Close'].iloc[-1])
-        previous = float(hist['Close'].iloc[-2])
-        change = current - previous
-        change_pct = (change / previous) * 100 if previous else None
-        db.insert_or_update_alternative_asset(
-          symbol=symbol, name='Norwegian Krone', asset_type='currency',
-          value=round(current, 4), change=round(change, 4) if change_pct is not None else None,
-          change_percent=round(change_pct, 2) if change_pct is not None else None,
-          fetch_error=None
-        )
-        print(f"[OK] yfinance: {current:.4f} ({change_pct:+.2f}%)")
-        success_count += 1
-        success = True
-    except Exception as e:
-      print(f"[WARN] yfinance failed ({e}), trying FRED... ", end="")
+def fetch_and_import_alternative_assets():
+  """
+  Fetch crypto, commodities, and currencies with intelligent fallbacks.
+  Primary: yfinance -> Secondary: CoinGecko/FRED -> NULL if all fail.
+  yfinance prices come from one batched download; the per-asset
+  fallbacks and writes then run concurrently (DatabaseManager connections
+  are per thread).
+  """
+  print("\n" + "=" * 60)
+  print("FETCHING ALTERNATIVE ASSETS (with fallbacks)")
+  print("=" * 60)
 
-    if not success:
-      if not fred:
-        raise Exception("FRED API not configured")
-      start_date = (datetime.now() - timedelta(days=10)).strftime('%Y-%m-%d')
-      nok_data = fred.get_series('DEXNOUS', observation_start=start_date)
-      if len(nok_data) < 2:
-        raise Exception(f"Insufficient FRED data: {len(nok_data)} points")
-      current = float(nok_data.iloc[-1])
-      previous = float(nok_data.iloc[-2])
-      change = current - previous
-      change_pct = (change / previous) * 100 if previous else None
-      db.insert_or_update_alternative_asset(
-        symbol=symbol, name='Norwegian Krone', asset_type='currency',
-        value=round(current, 4), change=round(change, 4) if change_pct is not None else None,
-        change_percent=round(change_pct, 2) if change_pct is not None else None,
-        fetch_error=None
+  # Shared observation window for every FRED fallback
+  fred_start = (datetime.now() - timedelta(days=10)).strftime('%Y-%m-%d')
+
+  # All CoinGecko fallbacks share one multi-coin request, made only when
+  # the first crypto falls back and reused by the rest
+  coingecko_ids = [spec[5] for spec in ALTERNATIVE_ASSETS if spec[4] == 'CoinGecko']
+  coingecko_lock = threading.Lock()
+  coingecko_cache = {}
+
+  def coingecko_prices():
+    with coingecko_lock:
+      if 'prices' not in coingecko_cache:
+        coingecko_cache['prices'] = fetch_cryptos_from_coingecko(coingecko_ids)
+      return coingecko_cache['prices']
+
+  # One batched Yahoo request for every asset instead of a history() call each
+  yf_closes = _download_closes([spec[1] for spec in ALTERNATIVE_ASSETS])
+
+  # Assets Yahoo had no usable data for will need FRED: fetch those series
+  # side by side now rather than one per worker as each falls back
+  fred_ids = [
+    spec[5] for spec in ALTERNATIVE_ASSETS
+    if spec[4] == 'FRED' and len(yf_closes.get(spec[1], ())) < 2
+  ]
+  fred_prefetched = {}
+  if fred and fred_ids:
+    with ThreadPoolExecutor(max_workers=len(fred_ids)) as executor:
+      futures = {
+        executor.submit(fred.get_series, series_id, observation_start=fred_start): series_id
+        for series_id in fred_ids
+      }
+      for future in as_completed(futures):
+        try:
+          fred_prefetched[futures[future]] = future.result()
+        except Exception as e:
+          # The worker retries it inline and records the failure
+          print(f"[WARN] FRED {futures[future]} prefetch failed ({e})")
+
+  def fred_data(series_id):
+    data = fred_prefetched.get(series_id)
+    if data is None:
+      data = fred.get_series(series_id, observation_start=fred_start)
+    return data
+
+  with ThreadPoolExecutor(max_workers=len(ALTERNATIVE_ASSETS)) as executor:
+    failures = [
+      failure
+      for failure in executor.map(
+        lambda spec: _fetch_alternative_asset(
+          spec, yf_closes.get(spec[1]), fred_data, coingecko_prices
+        ),
+        ALTERNATIVE_ASSETS,
       )
-      print(f"[OK] FRED: {current:.4f} ({change_pct:+.2f}%)")
-      success_count += 1
+      if failure
+    ]
 
-  except Exception as e:
-    store_failure(symbol, 'Norwegian Krone', 'currency', f"yfinance + FRED failed: {e}")
+  for symbol, name, asset_type, msg in failures:
+    logger.error("%s: [ERROR] All sources failed: %s", symbol, msg)
+    db.insert_or_update_alternative_asset(
+      symbol=symbol,
+      name=name,
+      asset_type=asset_type,
+      value=None,
+      change=None,
+      change_percent=None,
+      fetch_error=msg,
+    )
 
+  total = len(ALTERNATIVE_ASSETS)
+  success_count = total - len(failures)
   print("=" * 60)
-  print(f"[OK] Success: {success_count}/5 assets")
-  if fail_count > 0:
-    print(f"[ERROR] Failed: {fail_count}/5 assets (all sources exhausted)")
+  print(f"[OK] Success: {success_count}/{total} assets")
+  if failures:
+    print(f"[ERROR] Failed: {len(failures)}/{total} assets (all sources exhausted)")
   print("=" * 60)
 
   return success_count
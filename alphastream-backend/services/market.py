@@ -1,7 +1,10 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Dict
 
+import pandas as pd
+
 from clients.finnhub_client import FinnhubRateLimitError, finnhub
 from config import MARKET_TTL
 from models import (
@@ -21,60 +24,77 @@ logger = logging.getLogger(__name__)
 _market_cache = TTLCache(MARKET_TTL)
 
 
+# Market status by UTC hour: 14-21 Open, 9-14 Pre-Market, otherwise After-Hours
+_STATUS_BY_HOUR: tuple[MarketStatus, ...] = tuple(
+    "Open" if 14 <= hour < 21 else "Pre-Market" if 9 <= hour < 14 else "After-Hours"
+    for hour in range(24)
+)
+
+
 def _market_status() -> MarketStatus:
-    now = datetime.utcnow()
-    hour = now.hour
-    if 14 <= hour < 21:
-        return "Open"
-    if 9 <= hour < 14:
-        return "Pre-Market"
-    if 21 <= hour or hour < 9:
-        return "After-Hours"
-    return "Closed"
+    return _STATUS_BY_HOUR[datetime.utcnow().hour]
+
+
+_SECTOR_CHANGE_FIELDS = ("change1D", "change1W", "change1M", "change1Y")
+
+# (universe list, its sector performance). get_core_universe hands back the
+# same list object until the stocks it loads actually change, so identity
+# says whether to recompute; cache misses on the market state reuse it.
+_sector_perf_memo: tuple | None = None
 
 
 def _aggregate_sector_performance() -> List[SectorPerformance]:
+    global _sector_perf_memo
     universe = get_core_universe()
-    buckets: Dict[str, Dict[str, float]] = {}
-    counts: Dict[str, int] = {}
-
-    for stock in universe:
-        sector = stock.sector or "Unknown"
-        counts[sector] = counts.get(sector, 0) + 1
-        bucket = buckets.setdefault(
-            sector,
-            {"change1D": 0.0, "change1W": 0.0, "change1M": 0.0, "change1Y": 0.0},
-        )
-        bucket["change1D"] += stock.change1D
-        bucket["change1W"] += stock.change1W
-        bucket["change1M"] += stock.change1M
-        bucket["change1Y"] += stock.change1Y
-
-    performances: List[SectorPerformance] = []
-    for sector, sums in buckets.items():
-        count = max(counts.get(sector, 1), 1)
-        performances.append(
-            SectorPerformance(
-                sector=sector,
-                change1D=sums["change1D"] / count,
-                change1W=sums["change1W"] / count,
-                change1M=sums["change1M"] / count,
-                change1Y=sums["change1Y"] / count,
-            )
-        )
+    memo = _sector_perf_memo
+    if memo is not None and memo[0] is universe:
+        return memo[1]
+    if not universe:
+        return []
+
+    frame = pd.DataFrame(
+        [
+            (stock.sector or "Unknown", stock.change1D, stock.change1W, stock.change1M, stock.change1Y)
+            for stock in universe
+        ],
+        columns=["sector", *_SECTOR_CHANGE_FIELDS],
+    )
+    # sort=False keeps sectors in first-seen (market cap) order
+    means = frame.groupby("sector", sort=False).mean().reset_index()
+    performances = [
+        SectorPerformance(sector=sector, change1D=d1, change1W=w1, change1M=m1, change1Y=y1)
+        for sector, d1, w1, m1, y1 in means.to_numpy().tolist()
+    ]
+    _sector_perf_memo = (universe, performances)
     return performances
 
 
+INDEX_SYMBOLS = (
+    ("^GSPC", "S&P 500"),
+    ("^DJI", "Dow Jones"),
+    ("^IXIC", "Nasdaq"),
+)
+
+
 def _fetch_indices(cached_state: MarketState | None) -> List[MarketIndex]:
-    symbols = [
-        ("^GSPC", "S&P 500"),
-        ("^DJI", "Dow Jones"),
-        ("^IXIC", "Nasdaq"),
-    ]
     indices: List[MarketIndex] = []
-    for symbol, name in symbols:
-        try:
-            quote = finnhub.get_quote(symbol)
+    # The quotes are independent round trips: issue them together, then
+    # collect in INDEX_SYMBOLS order
+    with ThreadPoolExecutor(max_workers=len(INDEX_SYMBOLS)) as executor:
+        futures = {symbol: executor.submit(finnhub.get_quote, symbol) for symbol, _ in INDEX_SYMBOLS}
+        for symbol, name in INDEX_SYMBOLS:
+            try:
+                quote = futures[symbol].result()
+            except FinnhubRateLimitError:
+                if cached_state:
+                    logger.warning("Finnhub rate limited, using cached indices")
+                    return cached_state.indices
+                raise
+            except Exception as exc:
+                logger.warning("Failed to fetch index %s: %s", symbol, exc)
+                if cached_state:
+                    return cached_state.indices
+                continue
             indices.append(
                 MarketIndex(
                     symbol=symbol,
@@ -84,15 +104,6 @@ def _fetch_indices(cached_state: MarketState | None) -> List[MarketIndex]:
                     changePercent=quote.get("dp", 0.0),
                 )
             )
-        except FinnhubRateLimitError:
-            if cached_state:
-                logger.warning("Finnhub rate limited, using cached indices")
-                return cached_state.indices
-            raise
-        except Exception as exc:
-            logger.warning("Failed to fetch index %s: %s", symbol, exc)
-            if cached_state:
-                return cached_state.indices
     return indices
 
 
@@ -2,24 +2,27 @@
 News importer using FMP stable news endpoints with SQLite caching.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from operator import itemgetter
 from typing import List, Optional
 
 from database.db_manager import db
 from services.fmp_client import fmp_client
 
+_ARTICLE_FIELDS = ("title", "url", "publishedDate", "text", "site", "publisher", "image")
+_article_values = itemgetter(*_ARTICLE_FIELDS)
+# Per-field defaults for articles missing some of _ARTICLE_FIELDS
+_ARTICLE_DEFAULTS = ("", None, None, "", "", "", "")
 
-def _normalize_article(item: dict, ticker_override: Optional[str] = None) -> dict:
-    return {
-        "ticker": (ticker_override or item.get("symbol") or None),
-        "title": item.get("title", ""),
-        "url": item.get("url"),
-        "published_date": item.get("publishedDate"),
-        "snippet": item.get("text", ""),
-        "site": item.get("site", ""),
-        "publisher": item.get("publisher", ""),
-        "image": item.get("image", ""),
-    }
+
+def _normalize_article(item: dict, ticker_override: Optional[str] = None) -> tuple:
+    """FMP article -> news_articles row tuple (NEWS_ARTICLE_COLUMNS order)."""
+    try:
+        values = _article_values(item)
+    except KeyError:
+        values = tuple(item.get(k, d) for k, d in zip(_ARTICLE_FIELDS, _ARTICLE_DEFAULTS))
+    return (ticker_override or item.get("symbol") or None, *values)
 
 
 def refresh_general_news(limit: int = 50) -> int:
@@ -46,14 +49,36 @@ def refresh_stock_latest(limit: int = 100) -> int:
         return 0
 
 
+# Max concurrent per-ticker news calls in refresh_ticker_news
+TICKER_NEWS_CONCURRENCY = 8
+
+
+def _fetch_ticker_news(symbol: str, limit: int) -> List[tuple]:
+    """One ticker's normalized articles; errors are logged and yield [] so the other tickers still store."""
+    try:
+        articles = fmp_client.get_news_for_symbols([symbol], limit=limit)
+        return [_normalize_article(a, a.get("symbol") or symbol) for a in articles]
+    except Exception as exc:
+        print(f"[ERROR] Ticker news fetch failed for {symbol}: {exc}")
+        return []
+
+
 def refresh_ticker_news(symbols: List[str], limit: int = 20) -> int:
-    """Fetch news for specific tickers and cache."""
+    """
+    Fetch news for specific tickers and cache.
+    Each ticker gets its own call (and its own limit), fanned out over a
+    thread pool; the combined articles go through one bulk upsert.
+    """
+    if not symbols:
+        return 0
     try:
-        articles = fmp_client.get_news_for_symbols(symbols, limit=limit)
-        normalized = []
-        for a in articles:
-            sym = a.get("symbol") or (symbols[0] if symbols else None)
-            normalized.append(_normalize_article(a, sym))
+        workers = min(TICKER_NEWS_CONCURRENCY, len(symbols))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            normalized = [
+                article
+                for articles in executor.map(lambda sym: _fetch_ticker_news(sym, limit), symbols)
+                for article in articles
+            ]
         inserted = db.upsert_news_articles_bulk(normalized)
         return inserted
     except Exception as exc:
@@ -1,12 +1,20 @@
+from functools import lru_cache
+
 from models import Portfolio, PortfolioHolding
 from datetime import datetime
 
+@lru_cache(maxsize=1)
 def get_mock_portfolio() -> Portfolio:
-    """Return mock portfolio for testing."""
+    """
+    Return mock portfolio for testing.
+    The data is static, so it is built once and shared; Portfolio and its
+    holdings are frozen, so callers cannot mutate it. lastUpdated is the
+    time of that first build.
+    """
     return Portfolio(
         id="portfolio-1",
         name="Main Portfolio",
-        holdings=[
+        holdings=(
             PortfolioHolding(
                 ticker="AAPL",
                 name="Apple Inc.",
@@ -37,7 +45,7 @@ def get_mock_portfolio() -> Portfolio:
                 dailyPnLPercent=1.45,
                 strategy="Core Quality"
             ),
-        ],
+        ),
         totalValue=30000.0,
         totalCost=25000.0,
         cash=500.0,
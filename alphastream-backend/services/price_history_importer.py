@@ -3,8 +3,10 @@ Price history importer using FMP stable endpoints.
 Stores intraday and EOD bars in SQLite (price_bars table).
 """
 
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from database.db_manager import db
 from services.fmp_client import fmp_client
 
@@ -12,72 +14,103 @@ from services.fmp_client import fmp_client
 EOD_TTL_HOURS = 24
 # Intraday data is considered stale after 5 minutes during market hours
 INTRADAY_TTL_MINUTES = 5
+EOD_TTL = timedelta(hours=EOD_TTL_HOURS)
+INTRADAY_TTL = timedelta(minutes=INTRADAY_TTL_MINUTES)
+
+# Refreshes currently running, keyed by (symbol, timeframe). A second caller
+# for the same key waits for the first instead of fetching again.
+_in_flight: Dict[Tuple[str, str], threading.Event] = {}
+_in_flight_lock = threading.Lock()
+
+
+def _run_once(key: Tuple[str, str], refresh: Callable[[], int]) -> int:
+    """Run refresh() unless one for key is already running; if so, wait for it and return 0."""
+    with _in_flight_lock:
+        event = _in_flight.get(key)
+        is_owner = event is None
+        if is_owner:
+            event = _in_flight[key] = threading.Event()
+    if not is_owner:
+        event.wait()
+        return 0
+    try:
+        return refresh()
+    finally:
+        with _in_flight_lock:
+            del _in_flight[key]
+        event.set()
+
+
+def _older_than(last_updated: Optional[str], ttl: timedelta) -> bool:
+    """
+    Whether an ISO last_updated timestamp is missing or older than ttl.
+    price_bars.last_updated is written as datetime.now().isoformat(), so
+    ISO strings order like the times they encode and compare without
+    parsing. Legacy "YYYY-MM-DD HH:MM:SS" values sort as older, so they
+    just trigger a refresh that rewrites them.
+    """
+    return not last_updated or last_updated < (datetime.now() - ttl).isoformat()
 
 
 def _is_eod_stale(symbol: str) -> bool:
     """Check if EOD data for a symbol is stale (older than EOD_TTL_HOURS)."""
-    last_updated = db.get_eod_last_updated(symbol)
-    if not last_updated:
-        return True
-    
-    try:
-        # Parse the ISO timestamp
-        last_dt = datetime.fromisoformat(last_updated)
-        stale_threshold = datetime.now() - timedelta(hours=EOD_TTL_HOURS)
-        return last_dt < stale_threshold
-    except (ValueError, TypeError):
-        return True
+    return _older_than(db.get_eod_last_updated(symbol), EOD_TTL)
 
 
 def _is_intraday_stale(symbol: str, timeframe: str = "5min") -> bool:
     """Check if intraday data for a symbol is stale (older than INTRADAY_TTL_MINUTES)."""
-    last_updated = db.get_intraday_last_updated(symbol, timeframe)
-    if not last_updated:
-        return True
-    
-    try:
-        # Parse the ISO timestamp
-        last_dt = datetime.fromisoformat(last_updated)
-        stale_threshold = datetime.now() - timedelta(minutes=INTRADAY_TTL_MINUTES)
-        return last_dt < stale_threshold
-    except (ValueError, TypeError):
-        return True
+    return _older_than(db.get_intraday_last_updated(symbol, timeframe), INTRADAY_TTL)
 
 
-def _normalize_bar(symbol: str, timeframe: str, bar: dict, source: str) -> dict:
+def _bar_rows(symbol: str, timeframe: str, bars: List[dict], source: str) -> List[tuple]:
     """
-    Normalize bar data from FMP.
+    Normalize FMP bars into price_bars row tuples (PRICE_BAR_COLUMNS order,
+    without last_updated) in one comprehension.
     FMP intraday returns: open, high, low, close, volume
     FMP EOD (full endpoint) returns: open, high, low, close, volume, change, changePercent, vwap
     """
-    return {
-        "symbol": symbol,
-        "timeframe": timeframe,
-        "bar_time": bar.get("date"),
-        "open": bar.get("open"),
-        "high": bar.get("high"),
-        "low": bar.get("low"),
-        "close": bar.get("close"),
-        "volume": bar.get("volume"),
-        "source": source,
-    }
-
-
-def refresh_intraday(symbol: str, interval: str = "5min", limit: int = 500) -> int:
-    """Fetch intraday bars and cache."""
+    return [
+        (
+            symbol,
+            timeframe,
+            b.get("date"),
+            b.get("open"),
+            b.get("high"),
+            b.get("low"),
+            b.get("close"),
+            b.get("volume"),
+            source,
+        )
+        for b in bars
+    ]
+
+
+def refresh_intraday(
+    symbol: str, interval: str = "5min", limit: int = 500, force: bool = False
+) -> int:
+    """
+    Fetch intraday bars and cache.
+    Skipped while the cached bars are younger than INTRADAY_TTL_MINUTES
+    unless force; concurrent refreshes of the same symbol run once.
+    """
+    if not force and not _is_intraday_stale(symbol, interval):
+        return 0
+    return _run_once(
+        (symbol, interval), lambda: _refresh_intraday(symbol, interval, limit)
+    )
+
+
+def _refresh_intraday(symbol: str, interval: str, limit: int) -> int:
     try:
-        # Clear old data first to ensure fresh data
-        db.delete_intraday_bars(symbol, interval)
-        
         bars = fmp_client.get_intraday_chart(symbol, interval=interval)
         if not bars:
             print(f"[WARN] No intraday data returned from FMP for {symbol}")
             return 0
         
         # API returns newest first; trim to limit then store
-        bars = bars[:limit]
-        normalized = [_normalize_bar(symbol, interval, b, "fmp") for b in bars]
-        count = db.upsert_price_bars_bulk(normalized)
+        count = db.upsert_price_bars_bulk(
+            _bar_rows(symbol, interval, bars[:limit], "fmp"), prune_older=True
+        )
         print(f"[OK] Intraday refresh for {symbol} ({interval}): {count} bars stored")
         return count
     except Exception as exc:
@@ -85,23 +118,28 @@ def refresh_intraday(symbol: str, interval: str = "5min", limit: int = 500) -> i
         return 0
 
 
-def refresh_eod(symbol: str, limit: int = 2000) -> int:
+def refresh_eod(symbol: str, limit: int = 2000, force: bool = False) -> int:
     """
     Fetch end-of-day history and cache.
     Default limit of 2000 covers ~8 years of trading days (252 per year).
+    Skipped while the cached bars are younger than EOD_TTL_HOURS unless
+    force; concurrent refreshes of the same symbol run once.
     """
+    if not force and not _is_eod_stale(symbol):
+        return 0
+    return _run_once((symbol, "1day"), lambda: _refresh_eod(symbol, limit))
+
+
+def _refresh_eod(symbol: str, limit: int) -> int:
     try:
-        # Clear old data first to ensure fresh data
-        db.delete_eod_bars(symbol)
-        
         bars = fmp_client.get_eod_history(symbol, adjusted=False, limit=limit)
         if not bars:
             print(f"[WARN] No EOD data returned from FMP for {symbol}")
             return 0
         
-        bars = bars[:limit]
-        normalized = [_normalize_bar(symbol, "1day", b, "fmp") for b in bars]
-        count = db.upsert_price_bars_bulk(normalized)
+        count = db.upsert_price_bars_bulk(
+            _bar_rows(symbol, "1day", bars[:limit], "fmp"), prune_older=True
+        )
         print(f"[OK] EOD refresh for {symbol}: {count} bars stored")
         return count
     except Exception as exc:
@@ -109,61 +147,92 @@ def refresh_eod(symbol: str, limit: int = 2000) -> int:
         return 0
 
 
+def _refresh_bulk(
+    refresh: Callable[[str], int], symbols: List[str], max_workers: int
+) -> Dict[str, int]:
+    """Run refresh(symbol) for each symbol on a bounded pool; {symbol: bars stored}."""
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return {}
+    results: Dict[str, int] = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as executor:
+        futures = {executor.submit(refresh, symbol): symbol for symbol in symbols}
+        for future in as_completed(futures):
+            # refresh_* log and swallow their own errors
+            results[futures[future]] = future.result()
+    return results
+
+
+def refresh_eod_bulk(
+    symbols: List[str], limit: int = 2000, force: bool = False, max_workers: int = 16
+) -> Dict[str, int]:
+    """refresh_eod for many symbols concurrently."""
+    return _refresh_bulk(
+        lambda symbol: refresh_eod(symbol, limit=limit, force=force), symbols, max_workers
+    )
+
+
+def _return_bars(window_days: int) -> int:
+    """EOD bars compute_return_from_eod reads for a window_days return."""
+    return window_days + 2
+
+
+def refresh_returns_bulk(symbols: List[str], window_days: int = 7) -> Dict[str, int]:
+    """
+    Refresh stale EOD bars for many symbols ahead of compute_return_from_eod
+    calls with the same window_days, so those read from the cache.
+    """
+    return refresh_eod_bulk(symbols, limit=_return_bars(window_days))
+
+
 def get_or_fetch_intraday(symbol: str, interval: str = "5min", limit: int = 500) -> List[dict]:
     """
     Return intraday bars from cache, fetching if empty or stale.
     Uses TTL-based cache invalidation to ensure fresh data.
+    The freshness checks run in SQL; bars are read once, after any refresh.
     """
-    bars = db.get_price_bars(symbol, interval, limit=limit)
-    
-    # Force refresh if no bars, data is stale, or data has null values
-    needs_refresh = (
-        not bars 
-        or _is_intraday_stale(symbol, interval)
-        or any(bar.get("close") is None for bar in bars[:5])  # Check first 5 bars for null
-    )
-    
-    if needs_refresh:
+    # Refresh if no bars / stale (no last_updated counts as stale) or the
+    # newest bars have null closes. Only null closes force the fetch: for
+    # staleness, refresh_intraday re-checks the TTL, so a caller that lost
+    # the race to a refresh that has just finished reuses its bars, and
+    # one that arrives mid-refresh waits on it (single flight).
+    has_nulls = db.has_null_closes(symbol, interval)
+    if has_nulls or _is_intraday_stale(symbol, interval):
         print(f"[REFRESH] Refreshing intraday data for {symbol} ({interval}) (stale or missing)")
-        refresh_intraday(symbol, interval=interval, limit=limit)
-        bars = db.get_price_bars(symbol, interval, limit=limit)
-    
-    return list(reversed(bars))  # oldest -> newest
+        refresh_intraday(symbol, interval=interval, limit=limit, force=has_nulls)
+
+    return db.get_price_bars(symbol, interval, limit=limit, order="asc")  # oldest -> newest
 
 
 def get_or_fetch_eod(symbol: str, limit: int = 2000) -> List[dict]:
     """
     Return EOD bars from cache, fetching if empty or stale.
     Uses TTL-based cache invalidation to ensure fresh data.
+    The freshness checks run in SQL; bars are read once, after any refresh.
     """
-    bars = db.get_price_bars(symbol, "1day", limit=limit)
-    
-    # Force refresh if no bars, data is stale, or data has null values
-    needs_refresh = (
-        not bars 
-        or _is_eod_stale(symbol)
-        or any(bar.get("close") is None for bar in bars[:5])  # Check first 5 bars for null
-    )
-    
-    if needs_refresh:
+    # Same single-flight/TTL handling as get_or_fetch_intraday
+    has_nulls = db.has_null_closes(symbol, "1day")
+    if has_nulls or _is_eod_stale(symbol):
         print(f"[REFRESH] Refreshing EOD data for {symbol} (stale or missing)")
-        refresh_eod(symbol, limit=limit)
-        bars = db.get_price_bars(symbol, "1day", limit=limit)
-    
-    return list(reversed(bars))  # oldest -> newest
+        refresh_eod(symbol, limit=limit, force=has_nulls)
+
+    return db.get_price_bars(symbol, "1day", limit=limit, order="asc")  # oldest -> newest
 
 
 def compute_return_from_eod(symbol: str, window_days: int = 7) -> Optional[float]:
     """
     Compute simple return over window_days using EOD closes.
-    Return in percent.
+    Return in percent. Reads just the two bookend closes from the cache;
+    refreshes first only if they are missing or the bars are stale.
     """
-    bars = get_or_fetch_eod(symbol, limit=window_days + 2)
-    if len(bars) < 2:
+    bars = _return_bars(window_days)
+    bookends = db.get_eod_close_bookends(symbol, bars)
+    if bookends is None or None in bookends or _is_eod_stale(symbol):
+        refresh_eod(symbol, limit=bars, force=True)
+        bookends = db.get_eod_close_bookends(symbol, bars)
+    if bookends is None:
         return None
-    start = bars[0].get("close")
-    end = bars[-1].get("close")
+    start, end = bookends
     if start in (None, 0) or end is None:
         return None
     return ((end - start) / start) * 100.0
-
@@ -1,9 +1,10 @@
 """Background scheduler for automatic database refresh"""
-import schedule
-import time
 import threading
-from datetime import datetime
-import pytz
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
 from services.hybrid_importer import (
     refresh_all_hybrid_data,
     fetch_and_import_market_movers_from_fmp,
@@ -21,26 +22,40 @@ from services.sector_importer import (
 from services.earnings_importer import refresh_earnings_window
 
 # US Eastern timezone
-ET = pytz.timezone('US/Eastern')
+ET = ZoneInfo('America/New_York')
+
+
+# (ET date, is weekday, session open, session close) for the last date seen
+_session_bounds: tuple | None = None
 
 
 def is_market_hours() -> bool:
     """Check if current time is during US market hours (9:30 AM - 4:00 PM ET)"""
+    global _session_bounds
     now_et = datetime.now(ET)
-    market_open = now_et.replace(hour=9, minute=30, second=0, microsecond=0)
-    market_close = now_et.replace(hour=16, minute=0, second=0, microsecond=0)
-
-    is_weekday = now_et.weekday() < 5
-    is_open = market_open <= now_et <= market_close
-    return is_weekday and is_open
+    bounds = _session_bounds
+    if bounds is None or bounds[0] != now_et.date():
+        # Weekday and session bounds only change with the date
+        bounds = _session_bounds = (
+            now_et.date(),
+            now_et.weekday() < 5,
+            now_et.replace(hour=9, minute=30, second=0, microsecond=0),
+            now_et.replace(hour=16, minute=0, second=0, microsecond=0),
+        )
+    _, is_weekday, market_open, market_close = bounds
+    return is_weekday and market_open <= now_et <= market_close
 
 
 def refresh_job():
     """Execute database refresh - called by APScheduler"""
     try:
         print(f"\nStarting scheduled refresh at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}...")
-        hybrid_counts = refresh_all_hybrid_data()
-        macro_counts = refresh_all_macro_data()
+        # Independent sources and tables: run side by side
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            hybrid_future = executor.submit(refresh_all_hybrid_data)
+            macro_future = executor.submit(refresh_all_macro_data)
+            hybrid_counts = hybrid_future.result()
+            macro_counts = macro_future.result()
 
         print("[OK] Refresh complete")
         print(f"   Hybrid: {hybrid_counts.get('stocks', 0)} stocks, {hybrid_counts.get('indices', 0)} indices")
@@ -51,42 +66,66 @@ def refresh_job():
         print(f"Refresh failed: {e}")
 
 
+# Jobs fire on their own timer thread; a job still running when its next
+# run comes due is skipped rather than stacked (max_instances=1), and runs
+# missed while the process was busy collapse into one (coalesce).
+scheduler = BackgroundScheduler(
+    timezone=ET,
+    job_defaults={"coalesce": True, "max_instances": 1, "misfire_grace_time": 60},
+)
+
+
+def market_hours_refresh_job():
+    if is_market_hours():
+        refresh_job()
+
+
+def off_hours_refresh_job():
+    if not is_market_hours():
+        refresh_job()
+
+
+def market_hours_fast_market_job():
+    if is_market_hours():
+        fast_market_job()
+
+
 def schedule_refresh():
     """Set up refresh schedule"""
-    # During market hours: every 15 minutes
-    schedule.every(15).minutes.do(lambda: refresh_job() if is_market_hours() else None)
+    # During market hours: every 15 minutes (the cron window brackets the
+    # session; is_market_hours() trims it to 9:30-16:00)
+    scheduler.add_job(
+        market_hours_refresh_job,
+        CronTrigger(day_of_week="mon-fri", hour="9-16", minute="*/15"),
+    )
 
     # Outside market hours: every hour
-    schedule.every().hour.do(lambda: refresh_job() if not is_market_hours() else None)
+    scheduler.add_job(off_hours_refresh_job, CronTrigger(minute=0))
 
     # News refresh (general + mixed stock feed) every 10 minutes
-    schedule.every(10).minutes.do(news_job)
+    scheduler.add_job(news_job, CronTrigger(minute="*/10"))
 
     # Fast market snapshot (sectors + movers) every 5 minutes during market hours
-    schedule.every(5).minutes.do(lambda: fast_market_job() if is_market_hours() else None)
+    scheduler.add_job(
+        market_hours_fast_market_job,
+        CronTrigger(day_of_week="mon-fri", hour="9-16", minute="*/5"),
+    )
 
     # Daily sector history backfill (early morning)
-    schedule.every().day.at("04:00").do(lambda: backfill_sector_history(days=45))
+    scheduler.add_job(backfill_sector_history, CronTrigger(hour=4, minute=0), kwargs={"days": 45})
 
     # Earnings refresh
-    schedule.every().hour.do(lambda: earnings_job(hourly=True))
-    schedule.every().day.at("04:30").do(lambda: earnings_job(hourly=False))
+    scheduler.add_job(earnings_job, CronTrigger(minute=0), kwargs={"hourly": True})
+    scheduler.add_job(earnings_job, CronTrigger(hour=4, minute=30), kwargs={"hourly": False})
 
     # Prune old news daily
-    schedule.every().day.at("03:00").do(lambda: prune_old_news(7))
+    scheduler.add_job(prune_old_news, CronTrigger(hour=3, minute=0), args=[7])
 
     print("Refresh scheduler initialized")
     print("   - Market hours (Mon-Fri 9:30 AM - 4:00 PM ET): Every 15 minutes")
     print("   - Outside market hours: Every hour")
     print("   - News: Every 10 minutes (general + stock latest)")
-    print("   - News prune: Daily at 03:00")
-
-
-def run_scheduler():
-    """Run the scheduler in a loop"""
-    while True:
-        schedule.run_pending()
-        time.sleep(30)
+    print("   - News prune: Daily at 03:00 ET")
 
 
 def start_scheduler_background():
@@ -97,10 +136,15 @@ def start_scheduler_background():
     def initial_refresh():
         print("\n[SCHEDULER] Running initial database refresh in background...")
         try:
-            refresh_job()
-            news_job()
-            fast_market_job()
-            earnings_job(hourly=False)
+            # Each job logs and swallows its own failures
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                for future in [
+                    executor.submit(refresh_job),
+                    executor.submit(news_job),
+                    executor.submit(fast_market_job),
+                    executor.submit(earnings_job, hourly=False),
+                ]:
+                    future.result()
             print("[SCHEDULER] Initial refresh completed")
         except Exception as e:
             print(f"[SCHEDULER] Initial refresh error: {e}")
@@ -109,8 +153,7 @@ def start_scheduler_background():
     init_thread = threading.Thread(target=initial_refresh, daemon=True)
     init_thread.start()
 
-    scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
-    scheduler_thread.start()
+    scheduler.start()
     print("[SCHEDULER] Background scheduler started\n")
 
 
@@ -142,14 +185,14 @@ def earnings_job(hourly: bool = False):
     """
     try:
         today = datetime.now().date()
-        if hourly:
-            start = today
-            end = today + timedelta(days=1)
-        else:
-            start = today - timedelta(days=1)
-            end = today + timedelta(days=14)
-        inserted = refresh_earnings_window(start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
-        print(f"[OK] Earnings refresh: {inserted} rows ({start} -> {end})")
+        start, end = (
+            (today, today + timedelta(days=1)) if hourly
+            else (today - timedelta(days=1), today + timedelta(days=14))
+        )
+        # date.isoformat() is YYYY-MM-DD; also used for the log line
+        start_str, end_str = start.isoformat(), end.isoformat()
+        inserted = refresh_earnings_window(start_str, end_str)
+        print(f"[OK] Earnings refresh: {inserted} rows ({start_str} -> {end_str})")
     except Exception as e:
         print(f"Earnings refresh failed: {e}")
 
@@ -3,52 +3,82 @@ Sector performance importer and aggregation.
 Uses FMP stable/sector-performance-snapshot with explicit date parameter.
 """
 
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional
 
+import numpy as np
+import pandas as pd
+
 from database.db_manager import db
 from services.fmp_client import fmp_client
 
 
+# Concurrent snapshot requests in backfill_sector_history
+SECTOR_BACKFILL_CONCURRENCY = 8
+
+
 def _today_str() -> str:
     return datetime.now().strftime("%Y-%m-%d")
 
 
-def _compound_percent(changes: List[float]) -> float:
+def _compound_by_sector(history: pd.DataFrame) -> pd.Series:
+    """
+    Compound each sector's daily percentage changes (e.g., [1.0, -0.5]) into
+    a single percent: expm1(sum(log1p(c / 100))) * 100, one grouped pass.
+    Sectors keep their first-seen order.
+    """
+    log_growth = np.log1p(history["average_change"] / 100.0)
+    return np.expm1(log_growth.groupby(history["sector"], sort=False).sum()) * 100.0
+
+
+def _sector_history_frame(window_days: int, end_date: Optional[date] = None) -> pd.DataFrame:
     """
-    Compound a list of percentage changes (e.g., [1.0, -0.5]) into a single percent.
+    Sector history rows for the window_days days ending end_date (default
+    today), sector and change non-null.
     """
-    total = 1.0
-    for c in changes:
-        total *= (1.0 + c / 100.0)
-    return (total - 1.0) * 100.0
+    end_date = end_date or datetime.now().date()
+    start_date = end_date - timedelta(days=window_days - 1)
+    history = db.get_sector_history(start_date=start_date.strftime("%Y-%m-%d"), end_date=end_date.strftime("%Y-%m-%d"))
+    frame = pd.DataFrame(history, columns=["date", "sector", "exchange", "average_change"])
+    frame = frame.dropna(subset=["sector", "average_change"])
+    return frame.astype({"average_change": float})
+
+
+def _fetch_sector_rows(snap_date: str, exchange: Optional[str] = None) -> List[tuple]:
+    """
+    Fetch the sector snapshot for snap_date as sector_performance_history
+    rows (date, sector, exchange, average_change). No DB access.
+    """
+    rows = fmp_client.get_sector_performance_snapshot(date=snap_date, exchange=exchange)
+    if not rows:
+        print(f"[WARN] No sector snapshot for {snap_date}")
+        return []
+    return [
+        (snap_date, r["sector"], r.get("exchange"), float(r["averageChange"]))
+        for r in rows
+        if r.get("sector") is not None and r.get("averageChange") is not None
+    ]
+
+
+def _store_sector_rows(to_store: List[tuple], latest: List[tuple]) -> int:
+    """Write history rows and the latest snapshot, each as one bulk upsert."""
+    inserted = db.upsert_sector_history_bulk(to_store)
+    # Update latest snapshot table for quick access to 1D
+    db.bulk_upsert_sector_performance(
+        [(sector, change) for _, sector, _, change in latest]
+    )
+    return inserted
 
 
 def refresh_sector_snapshot(date: Optional[str] = None, exchange: Optional[str] = None) -> int:
     """Fetch sector snapshot for a date (YYYY-MM-DD) and store in history."""
     snap_date = date or _today_str()
     try:
-        rows = fmp_client.get_sector_performance_snapshot(date=snap_date, exchange=exchange)
-        if not rows:
-            print(f"[WARN] No sector snapshot for {snap_date}")
+        to_store = _fetch_sector_rows(snap_date, exchange)
+        if not to_store:
             return 0
-        to_store = []
-        for r in rows:
-            if r.get("sector") is None or r.get("averageChange") is None:
-                continue
-            change_val = float(r.get("averageChange"))
-            sector_name = r.get("sector")
-            to_store.append(
-                {
-                    "date": snap_date,
-                    "sector": sector_name,
-                    "exchange": r.get("exchange"),
-                    "average_change": change_val,
-                }
-            )
-            # Update latest snapshot table for quick access to 1D
-            db.insert_or_update_sector_performance(sector=sector_name, change_percent=change_val)
-        inserted = db.upsert_sector_history_bulk(to_store)
+        inserted = _store_sector_rows(to_store, to_store)
         print(f"[OK] Stored {inserted} sector rows for {snap_date}")
         return inserted
     except Exception as exc:
@@ -56,69 +86,84 @@ def refresh_sector_snapshot(date: Optional[str] = None, exchange: Optional[str]
         return 0
 
 
+def _fetch_sector_rows_logged(snap_date: str, exchange: Optional[str]) -> List[tuple]:
+    try:
+        return _fetch_sector_rows(snap_date, exchange)
+    except Exception as exc:
+        print(f"[ERROR] Sector snapshot failed for {snap_date}: {exc}")
+        return []
+
+
 def backfill_sector_history(days: int = 45, exchange: Optional[str] = None) -> int:
-    """Backfill sector snapshots for the past N days (calendar days)."""
-    inserted_total = 0
+    """
+    Backfill sector snapshots for the past N days (calendar days).
+    The per-day requests run concurrently over fmp_client's keep-alive
+    pool; rows from every day are written in one bulk upsert at the end,
+    and the latest snapshot table takes the most recent day with data.
+    """
     today = datetime.now().date()
-    for i in range(days):
-        d = today - timedelta(days=i)
-        date_str = d.strftime("%Y-%m-%d")
-        inserted_total += refresh_sector_snapshot(date=date_str, exchange=exchange)
-    return inserted_total
+    dates = [(today - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+    if not dates:
+        return 0
+    with ThreadPoolExecutor(max_workers=min(SECTOR_BACKFILL_CONCURRENCY, len(dates))) as executor:
+        # map keeps dates order: newest day first
+        per_day = list(executor.map(lambda d: _fetch_sector_rows_logged(d, exchange), dates))
+    to_store = [row for day_rows in per_day for row in day_rows]
+    if not to_store:
+        return 0
+    latest = next(day_rows for day_rows in per_day if day_rows)
+    try:
+        inserted = _store_sector_rows(to_store, latest)
+    except Exception as exc:
+        print(f"[ERROR] Sector backfill write failed: {exc}")
+        return 0
+    print(f"[OK] Backfilled {inserted} sector rows over {days} days")
+    return inserted
 
 
-def get_sector_performance_aggregated(window_days: int = 1) -> List[Dict]:
+def get_sector_performance_aggregated(window_days: int = 1, today: Optional[date] = None) -> List[Dict]:
     """
     Return aggregated sector performance over the last N days (compounded).
-    window_days: 1, 7, 30 supported by caller.
+    window_days: 1, 7, 30 supported by caller. today defaults to the current date.
     """
-    end_date = datetime.now().date()
-    start_date = end_date - timedelta(days=window_days - 1)
-    history = db.get_sector_history(start_date=start_date.strftime("%Y-%m-%d"), end_date=end_date.strftime("%Y-%m-%d"))
+    compounded = _compound_by_sector(_sector_history_frame(window_days, today))
+    return [{"sector": sector, "change": change} for sector, change in compounded.items()]
 
-    # Group by sector
-    by_sector: Dict[str, List[float]] = {}
-    for row in history:
-        sector = row.get("sector")
-        change = row.get("average_change")
-        if sector is None or change is None:
-            continue
-        by_sector.setdefault(sector, []).append(float(change))
 
-    results = []
-    for sector, changes in by_sector.items():
-        compounded = _compound_percent(changes)
-        results.append({"sector": sector, "change": compounded})
-    return results
+# Summary field -> trailing window in days
+_SUMMARY_WINDOWS = (("change1D", 1), ("change1W", 7), ("change1M", 30))
 
 
 def get_sector_performance_summary() -> List[Dict]:
     """
     Build {sector, change1D, change1W, change1M} from stored history.
+    The longest window is read once; shorter ones are slices of it.
     """
     latest_date = db.get_latest_sector_history_date()
     if not latest_date:
         return []
 
-    # Ensure today snapshot exists; if not, try to fetch
-    if latest_date != _today_str():
-        refresh_sector_snapshot(date=_today_str())
-
-    agg_1d = get_sector_performance_aggregated(window_days=1)
-    agg_1w = get_sector_performance_aggregated(window_days=7)
-    agg_1m = get_sector_performance_aggregated(window_days=30)
-
-    # Merge by sector
-    summary: Dict[str, Dict] = {}
-
-    for row in agg_1d:
-        summary[row["sector"]] = {"sector": row["sector"], "change1D": row["change"], "change1W": 0.0, "change1M": 0.0}
-    for row in agg_1w:
-        summary.setdefault(row["sector"], {"sector": row["sector"], "change1D": 0.0, "change1W": 0.0, "change1M": 0.0})
-        summary[row["sector"]]["change1W"] = row["change"]
-    for row in agg_1m:
-        summary.setdefault(row["sector"], {"sector": row["sector"], "change1D": 0.0, "change1W": 0.0, "change1M": 0.0})
-        summary[row["sector"]]["change1M"] = row["change"]
-
-    return list(summary.values())
+    # One clock read for the whole summary
+    today = datetime.now().date()
+    today_str = today.isoformat()
 
+    # Ensure today snapshot exists; if not, try to fetch
+    if latest_date != today_str:
+        refresh_sector_snapshot(date=today_str)
+
+    history = _sector_history_frame(max(days for _, days in _SUMMARY_WINDOWS), today)
+    # One log-growth column per window (NaN outside it), summed in a single
+    # groupby; a sector with no rows in a window sums to 0 -> 0.0 change
+    log_growth = np.log1p(history["average_change"] / 100.0)
+    starts = {
+        field: (today - timedelta(days=days - 1)).isoformat()
+        for field, days in _SUMMARY_WINDOWS
+    }
+    windows = pd.DataFrame({
+        field: log_growth.where(history["date"] >= start) for field, start in starts.items()
+    })
+    summary = np.expm1(windows.groupby(history["sector"], sort=False).sum()) * 100.0
+    return [
+        {"sector": sector, **changes}
+        for sector, changes in zip(summary.index, summary.to_dict("records"))
+    ]
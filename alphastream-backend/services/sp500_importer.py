@@ -1,4 +1,4 @@
-import requests
+import re
 import time
 from datetime import datetime
 import sys
@@ -8,58 +8,60 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from database.db_manager import db
+from utils.http import stream_json_kvitems
+
+
+_MISSING = frozenset(['--', 'N/A', '', 'None'])
+# Characters dropped before float(): thousands separators and whitespace,
+# plus sign/percent marks for percentages
+_NUMBER_JUNK = re.compile(r'[,\s]')
+_PERCENT_JUNK = re.compile(r'[,+%\s]')
+# Market cap suffix -> multiplier to millions
+_CAP_MULTIPLIERS = {'T': 1_000_000, 'B': 1_000, 'M': 1}
 
 
 def clean_percent(value: str) -> float:
     """Convert '+12.34%' or '-5.67%' to float 12.34 or -5.67"""
-    if not value or value in ['--', 'N/A', '', 'None']:
+    if not value or value in _MISSING:
         return 0.0
     try:
-        clean_val = value.replace('%', '').replace('+', '').replace(',', '').strip()
-        return float(clean_val)
-    except (ValueError, AttributeError):
+        return float(_PERCENT_JUNK.sub('', str(value)))
+    except ValueError:
         return 0.0
 
 
 def clean_float(value: str) -> float:
     """Convert any string to float, handling commas and invalid data"""
-    if not value or value in ['--', 'N/A', '', 'None']:
+    if not value or value in _MISSING:
         return 0.0
     try:
-        clean_val = str(value).replace(',', '').strip()
-        return float(clean_val)
-    except (ValueError, AttributeError):
+        return float(_NUMBER_JUNK.sub('', str(value)))
+    except ValueError:
         return 0.0
 
 
 def clean_int(value: str) -> int:
     """Convert string to int, handling commas, slashes, and invalid data"""
-    if not value or value in ['--', 'N/A', '', 'None']:
+    if not value or value in _MISSING:
         return 0
     try:
-        clean_val = str(value).replace(',', '').strip()
-        if '/' in clean_val:
-            clean_val = clean_val.split('/')[0]
-        return int(float(clean_val))
-    except (ValueError, AttributeError):
+        clean_val = _NUMBER_JUNK.sub('', str(value))
+        return int(float(clean_val.partition('/')[0]))
+    except ValueError:
         return 0
 
 
 def parse_market_cap(value: str) -> float:
     """Convert '405,280.20M' to float 405280.20 (millions)"""
-    if not value or value in ['--', 'N/A', '', 'None']:
+    if not value or value in _MISSING:
         return 0.0
     try:
-        clean_val = str(value).replace(',', '').strip()
-        if 'T' in clean_val:
-            return float(clean_val.replace('T', '')) * 1_000_000
-        elif 'B' in clean_val:
-            return float(clean_val.replace('B', '')) * 1_000
-        elif 'M' in clean_val:
-            return float(clean_val.replace('M', ''))
-        else:
+        clean_val = _NUMBER_JUNK.sub('', str(value))
+        multiplier = _CAP_MULTIPLIERS.get(clean_val[-1:])
+        if multiplier is None:
             return float(clean_val)
-    except (ValueError, AttributeError):
+        return float(clean_val[:-1]) * multiplier
+    except ValueError:
         return 0.0
 
 
@@ -126,14 +128,12 @@ def fetch_and_import_sp500() -> int:
     start_time = time.time()
 
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        raw_data = response.json()
-
-        print(f"Fetched {len(raw_data)} stocks")
-
+        # Parse each ticker's entry as it streams in rather than decoding
+        # the whole buffered body at once
         parsed_stocks = []
-        for ticker, stock_data in raw_data.items():
+        fetched = 0
+        for ticker, stock_data in stream_json_kvitems(url, timeout=30):
+          fetched += 1
           try:
             stock_data['ticker'] = ticker
             parsed = parse_stock_data(stock_data)
@@ -142,6 +142,7 @@ def fetch_and_import_sp500() -> int:
           except Exception as e:
             print(f"Error parsing {ticker}: {e}")
 
+        print(f"Fetched {fetched} stocks")
         count = db.insert_stocks_bulk(parsed_stocks)
 
         duration = time.time() - start_time
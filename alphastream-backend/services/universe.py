@@ -1,6 +1,8 @@
 import logging
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
 
 from database.db_manager import db
 from config import STOCK_TTL, UNIVERSE_TTL
@@ -11,58 +13,148 @@ logger = logging.getLogger(__name__)
 
 _universe_cache = TTLCache(UNIVERSE_TTL)
 _stock_cache = TTLCache(STOCK_TTL)
+# (stocks, ticker -> Stock index, search index)
+_Universe = Tuple[List[Stock], Dict[str, Stock], "_SearchIndex"]
+
+# Serializes universe reloads (see _load_core_universe)
+_universe_lock = threading.Lock()
+
+
+# stocks columns read per row: kept as-is, and coerced with float(x or 0)
+_stock_row_values = itemgetter(
+    "ticker", "name", "sector", "industry", "pe_ratio", "dividend_yield", "beta", "eps",
+    "last_updated",
+)
+_stock_row_numbers = itemgetter(
+    "market_cap", "price", "change_1d", "change_1w", "change_1m", "change_ytd", "change_1y",
+    "change_5y", "volume", "gross_margin", "net_profit_margin", "roe", "weight",
+)
 
 
 def _map_db_row_to_stock(data: Dict) -> Stock:
-    """Convert a database row into the Stock model."""
+    """Convert a database row (SELECT * FROM stocks) into the Stock model."""
+    ticker, name, sector, industry, pe_ratio, dividend_yield, beta, eps, updated = _stock_row_values(data)
+    (
+        market_cap, price, change_1d, change_1w, change_1m, change_ytd, change_1y,
+        change_5y, volume, gross_margin, net_margin, roe, weight,
+    ) = [float(v or 0) for v in _stock_row_numbers(data)]
+    ticker = ticker or ""
     return Stock(
-        ticker=data.get("ticker", ""),
-        name=data.get("name", data.get("ticker", "")),
-        sector=data.get("sector") or "Unknown",
-        industry=data.get("industry") or "Unknown",
-        marketCap=float(data.get("market_cap") or 0),
-        price=float(data.get("price") or 0),
-        change1D=float(data.get("change_1d") or 0),
-        change1W=float(data.get("change_1w") or 0),
-        change1M=float(data.get("change_1m") or 0),
-        changeYTD=float(data.get("change_ytd") or 0),
-        change1Y=float(data.get("change_1y") or 0),
-        change5Y=float(data.get("change_5y") or 0),
-        peRatio=data.get("pe_ratio"),
+        ticker=ticker,
+        name=name or ticker,
+        sector=sector or "Unknown",
+        industry=industry or "Unknown",
+        marketCap=market_cap,
+        price=price,
+        change1D=change_1d,
+        change1W=change_1w,
+        change1M=change_1m,
+        changeYTD=change_ytd,
+        change1Y=change_1y,
+        change5Y=change_5y,
+        peRatio=pe_ratio,
         forwardPE=None,
         pegRatio=None,
         priceToBook=None,
         evToEbitda=None,
         evToSales=None,
-        dividendYield=data.get("dividend_yield"),
-        beta=data.get("beta"),
-        eps=data.get("eps"),
-        volume=float(data.get("volume") or 0),
-        avgVolume=float(data.get("volume") or 0),
-        grossMargin=float(data.get("gross_margin") or 0),
+        dividendYield=dividend_yield,
+        beta=beta,
+        eps=eps,
+        volume=volume,
+        avgVolume=volume,
+        grossMargin=gross_margin,
         operatingMargin=0.0,
-        netMargin=float(data.get("net_profit_margin") or 0),
-        roe=float(data.get("roe") or 0),
+        netMargin=net_margin,
+        roe=roe,
         roic=0.0,
         revenueGrowth=0.0,
         earningsGrowth=0.0,
         fcfYield=0.0,
         catalysts=[],
-        weight=float(data.get("weight") or 0.0),
-        updatedAt=data.get("last_updated") or datetime.utcnow().isoformat(),
+        weight=weight,
+        updatedAt=updated or datetime.utcnow().isoformat(),
     )
 
 
-def get_core_universe(force_refresh: bool = False) -> List[Stock]:
+def _load_core_universe(force_refresh: bool = False) -> _Universe:
+    """
+    Cached _Universe; the ticker and search indexes are built once per load,
+    not per lookup. Concurrent misses share one reload.
+    """
     cached, stale = _universe_cache.get("core")
     if cached and not force_refresh and not stale:
         return cached
 
+    with _universe_lock:
+        # Whoever held the lock may have just reloaded it: re-check so
+        # waiting threads reuse that load instead of each rescanning stocks
+        if not force_refresh:
+            cached, stale = _universe_cache.get("core")
+            if cached and not stale:
+                return cached
+        return _reload_core_universe(cached)
+
+
+# Substring queries at least this long are answered from trigram postings
+_TRIGRAM = 3
+
+
+class _SearchIndex:
+    """
+    Lowercased (ticker, name) keys per universe position, plus trigram ->
+    positions postings over both. A query of 3+ chars only checks the
+    positions holding all of its trigrams, not the whole universe.
+    """
+
+    __slots__ = ("keys", "trigrams")
+
+    def __init__(self, stocks: List[Stock]):
+        self.keys = [(stock.ticker.lower(), stock.name.lower()) for stock in stocks]
+        trigrams: Dict[str, set] = {}
+        for pos, (ticker_lower, name_lower) in enumerate(self.keys):
+            for text in (ticker_lower, name_lower):
+                for i in range(len(text) - _TRIGRAM + 1):
+                    trigrams.setdefault(text[i:i + _TRIGRAM], set()).add(pos)
+        self.trigrams = trigrams
+
+    def positions(self, query_lower: str) -> List[int]:
+        """Universe positions whose ticker or name contains query_lower, in order."""
+        if len(query_lower) < _TRIGRAM:
+            candidates = range(len(self.keys))
+        else:
+            postings = []
+            for i in range(len(query_lower) - _TRIGRAM + 1):
+                posting = self.trigrams.get(query_lower[i:i + _TRIGRAM])
+                if not posting:
+                    return []
+                postings.append(posting)
+            candidates = sorted(set.intersection(*postings))
+        # Trigrams can come from either field or be out of order: verify
+        keys = self.keys
+        return [
+            pos for pos in candidates
+            if query_lower in keys[pos][0] or query_lower in keys[pos][1]
+        ]
+
+
+def _reload_core_universe(cached: Optional[_Universe]) -> _Universe:
     try:
         rows = db.get_all_stocks(order_by="market_cap DESC")
         stocks = [_map_db_row_to_stock(row) for row in rows]
-        _universe_cache.set("core", stocks)
-        return stocks
+        if cached is not None and stocks == cached[0]:
+            # Unchanged since the last load: keep the same list (and its
+            # index) so identity-keyed memos (market sector performance)
+            # stay valid
+            _universe_cache.set("core", cached)
+            return cached
+        universe = (
+            stocks,
+            {stock.ticker: stock for stock in stocks},
+            _SearchIndex(stocks),
+        )
+        _universe_cache.set("core", universe)
+        return universe
     except Exception as exc:
         logger.warning("Failed to load universe from DB: %s", exc)
         if cached:
@@ -70,14 +162,13 @@ def get_core_universe(force_refresh: bool = False) -> List[Stock]:
         raise
 
 
+def get_core_universe(force_refresh: bool = False) -> List[Stock]:
+    return _load_core_universe(force_refresh)[0]
+
+
 def search_symbol(query: str) -> List[Stock]:
-    universe = get_core_universe()
-    query_lower = query.lower()
-    return [
-        stock
-        for stock in universe
-        if query_lower in stock.ticker.lower() or query_lower in stock.name.lower()
-    ]
+    universe, _, search_index = _load_core_universe()
+    return [universe[pos] for pos in search_index.positions(query.lower())]
 
 
 def get_stock_detail(ticker: str) -> Optional[Stock]:
@@ -85,9 +176,7 @@ def get_stock_detail(ticker: str) -> Optional[Stock]:
     if cached and not stale:
         return cached
 
-    universe = get_core_universe()
-    for stock in universe:
-        if stock.ticker == ticker:
-            _stock_cache.set(ticker, stock)
-            return stock
-    return None
+    stock = _load_core_universe()[1].get(ticker)
+    if stock is not None:
+        _stock_cache.set(ticker, stock)
+    return stock
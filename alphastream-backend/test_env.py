@@ -1,18 +1,22 @@
-# import os
-# from dotenv import load_dotenv
+"""Manual environment/yfinance check: python test_env.py."""
 
-# load_dotenv()
 
-# print("Testing environment variables:")
-# print(f"FRED_API_KEY exists: {bool(os.getenv('FRED_API_KEY'))}")
-# print(f"FRED_API_KEY length: {len(os.getenv('FRED_API_KEY', ''))}")
-# print(f"FRED_API_KEY first 5 chars: {os.getenv('FRED_API_KEY', '')[:5]}")
+def main():
+    import os
 
+    from dotenv import load_dotenv
 
+    load_dotenv()
 
+    print("Testing environment variables:")
+    print(f"FRED_API_KEY exists: {bool(os.getenv('FRED_API_KEY'))}")
 
-import yfinance as yf
-ticker = yf.Ticker("^GSPC")
-hist = ticker.history(period='1mo')
-print(f"Rows: {len(hist)}")
-print(hist.tail(3))
+    import yfinance as yf
+    ticker = yf.Ticker("^GSPC")
+    hist = ticker.history(period='1mo')
+    print(f"Rows: {len(hist)}")
+    print(hist.tail(3))
+
+
+if __name__ == "__main__":
+    main()
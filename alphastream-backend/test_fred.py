@@ -1,11 +1,21 @@
-from fredapi import Fred
+"""Manual FRED connectivity check: python test_fred.py (key from FRED_API_KEY / .env)."""
 
-# Replace with your actual key
-FRED_API_KEY = "302b744fee5892e7cfe35647ee20ac06"
 
-try:
-    fred = Fred(api_key=FRED_API_KEY)
-    data = fred.get_series('DGS10', limit=1)
-    print(f"SUCCESS! 10Y Yield: {data.iloc[0]}")
-except Exception as e:
-    print(f"ERROR: {e}")
\ No newline at end of file
+def main():
+    from fredapi import Fred
+
+    from config import FRED_API_KEY
+
+    if not FRED_API_KEY:
+        raise SystemExit("FRED_API_KEY not set (environment or .env)")
+
+    try:
+        fred = Fred(api_key=FRED_API_KEY)
+        data = fred.get_series('DGS10', limit=1)
+        print(f"SUCCESS! 10Y Yield: {data.iloc[0]}")
+    except Exception as e:
+        print(f"ERROR: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,37 @@
 from __future__ import annotations
 
+import heapq
+import json
+import os
+import threading
 import time
-from typing import Any, Dict, Tuple
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache"
 
 
 class TTLCache:
-    """Simple in-memory TTL cache with stale indication."""
+    """
+    Simple in-memory TTL cache with stale indication.
+    Expired entries stay available as stale fallbacks for another ttl, then
+    are evicted by a lazy sweep over a (expires_at, key) min-heap. With
+    max_size set, the entries closest to expiry are evicted beyond it.
+    """
 
-    def __init__(self, ttl_seconds: int):
+    def __init__(self, ttl_seconds: int, max_size: int | None = None):
         self.ttl = ttl_seconds
+        self.max_size = max_size
         self._store: Dict[str, Tuple[Any, float]] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
 
     def set(self, key: str, value: Any) -> None:
-        self._store[key] = (value, time.time() + self.ttl)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._store[key] = (value, expires_at)
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+            self._sweep(expires_at - self.ttl)
 
     def get(self, key: str) -> Tuple[Any, bool]:
         """
@@ -20,15 +39,72 @@ class TTLCache:
         If missing, returns (None, False).
         If expired, returns (value, True) so callers can decide to use stale data.
         """
+        now = time.time()
+        # Lock-free peek: a concurrent _sweep()/clear() may empty the heap
+        # (or swap it for a rebuilt one) between the check and the index
+        try:
+            sweep_due = self._expiry_heap[0][0] < now - self.ttl
+        except IndexError:
+            sweep_due = False
+        if sweep_due:
+            with self._lock:
+                self._sweep(now)
         item = self._store.get(key)
         if not item:
             return None, False
         value, expires_at = item
-        now = time.time()
         if now > expires_at:
             return value, True
         return value, False
 
+    def _sweep(self, now: float) -> None:
+        """Evict entries expired over a ttl ago, then any beyond max_size. Holds _lock."""
+        heap = self._expiry_heap
+        while heap and (
+            heap[0][0] < now - self.ttl
+            or (self.max_size is not None and len(self._store) > self.max_size)
+        ):
+            expires_at, key = heapq.heappop(heap)
+            # Re-set keys leave older heap entries behind; only the entry
+            # matching the stored expiry evicts
+            item = self._store.get(key)
+            if item is not None and item[1] == expires_at:
+                del self._store[key]
+        # Superseded entries pile up when hot keys are re-set; rebuild the
+        # heap from the live entries once they dominate it
+        if len(heap) > 2 * len(self._store) + 64:
+            self._expiry_heap = [(exp, key) for key, (_, exp) in self._store.items()]
+            heapq.heapify(self._expiry_heap)
+
     def clear(self) -> None:
-        self._store.clear()
+        with self._lock:
+            self._store.clear()
+            self._expiry_heap.clear()
+
+
+def disk_cached(
+    key: str, ttl_seconds: int, fetch_fn: Callable[[], Any], force: bool = False
+) -> Any:
+    """
+    Return the JSON value cached at CACHE_DIR/<key>.json if it is younger
+    than ttl_seconds (by mtime); otherwise call fetch_fn() and cache its result.
+    Empty results are returned but not cached. force=True skips the cache.
+    """
+    path = CACHE_DIR / f"{key}.json"
+    if not force:
+        try:
+            if time.time() - path.stat().st_mtime < ttl_seconds:
+                return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass
 
+    value = fetch_fn()
+    if value:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".json.tmp")
+            tmp_path.write_text(json.dumps(value), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+    return value
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+def run_importers(importers: Dict[str, Callable[[], int]]) -> Dict[str, int]:
+    """
+    Run independent importers ({name: zero-arg callable}) concurrently and
+    return {name: count}. Meant for stages that hit different upstream APIs
+    and write different tables; DatabaseManager connections are per thread.
+    A failed importer is logged and counts as 0.
+    """
+    counts: Dict[str, int] = {}
+    with ThreadPoolExecutor(max_workers=len(importers)) as executor:
+        futures = {executor.submit(fn): name for name, fn in importers.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                counts[name] = future.result()
+            except Exception as exc:
+                logger.error("%s import failed: %s", name, exc)
+                counts[name] = 0
+    return counts
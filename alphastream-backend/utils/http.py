@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from typing import Any, Iterator, Tuple
+
+import ijson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def _build_session() -> requests.Session:
+    """Keep-alive session with a connection pool and GET retries on transient errors."""
+    session = requests.Session()
+    session.headers.update({"User-Agent": "alphastream/1.0"})
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=("GET",),
+            ),
+        ),
+    )
+    return session
+
+
+# Shared by the requests-based fetchers (SP500Live, CoinGecko, FRED); FMP has its own client
+http_session = _build_session()
+
+
+def stream_json_kvitems(url: str, timeout: int = 30, chunk_size: int = 64 * 1024) -> Iterator[Tuple[str, Any]]:
+    """
+    GET url over http_session and yield the (key, value) pairs of its
+    top-level JSON object as the body streams in, so the raw body and the
+    full decoded dict are never held together. Yields nothing if the top
+    level is not an object.
+    """
+    items = ijson.sendable_list()
+    parser = ijson.kvitems_coro(items, "", use_float=True)
+    with http_session.get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            parser.send(chunk)
+            yield from items
+            del items[:]
+    parser.close()
+    yield from items